@@ -0,0 +1,242 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter_ns
+import numpy as np
+from engine import GameEngine, STAGES, TUNABLES
+from headless import SCRIPTS, make_script
+from player import PLAYER_TYPES, create_player
+from projectile import WIDTH, HEIGHT
+
+INPUTS = sorted(SCRIPTS) + ["bot"]
+
+INT_COLUMNS = ("ticks", "score", "level", "peak_enemies", "peak_bullets", "peak_enemy_bullets")
+RESULT_COLUMNS = (
+    "ticks",
+    "game_over",
+    "score",
+    "level",
+    "health",
+    "spawn_delay",
+    "peak_enemies",
+    "peak_bullets",
+    "peak_enemy_bullets",
+    "tick_mean_us",
+    "tick_p95_us",
+    "tick_max_us",
+) + tuple(f"{name}_us" for name in STAGES)
+
+def split_tuning(config):
+    engine_tuning = {}
+    player_tuning = {}
+    for name, value in config.items():
+        if name.startswith("player."):
+            player_tuning[name[len("player."):]] = value
+        else:
+            engine_tuning[name] = value
+    return engine_tuning, player_tuning
+
+def check_config(config):
+    engine_tuning, player_tuning = split_tuning(config)
+    for name in engine_tuning:
+        if name not in TUNABLES:
+            raise ValueError(f"unknown tuning parameter: {name!r}")
+    player = create_player("normal", 0, 0)
+    for name in player_tuning:
+        if not hasattr(player, name) or callable(getattr(player, name)):
+            raise ValueError(f"unknown player stat: {name!r}")
+
+def run_session(session):
+    index, seed, character, script_name, config, ticks = session
+    engine_tuning, player_tuning = split_tuning(config)
+    player = create_player(character, WIDTH // 2, HEIGHT // 2)
+    for name, value in player_tuning.items():
+        setattr(player, name, value)
+    engine = GameEngine(player, seed=seed, tuning=engine_tuning)
+    script = make_script(script_name, engine)
+    timings = engine.timings = {}
+    stage_totals = dict.fromkeys(STAGES, 0)
+    tick_ns = np.zeros(ticks, dtype=np.int64)
+    peak_enemies = peak_bullets = peak_enemy_bullets = 0
+    
+    tick = 0
+    while tick < ticks and not engine.game_over:
+        frame = script(tick)
+        timings.clear()
+        start = perf_counter_ns()
+        engine.step(frame)
+        tick_ns[tick] = perf_counter_ns() - start
+        for name in STAGES:
+            stage_totals[name] += timings[name]
+        peak_enemies = max(peak_enemies, len(engine.enemies))
+        peak_bullets = max(peak_bullets, len(engine.lasers) + len(engine.bullets) + len(engine.bullet_store))
+        peak_enemy_bullets = max(peak_enemy_bullets, len(engine.enemy_bullets))
+        tick += 1
+    
+    tick_ns = tick_ns[:tick] / 1000
+    if not tick:
+        tick_ns = np.zeros(1)
+    player = engine.player
+    return (index, engine.tick, engine.game_over, player.score, player.level, player.health,
+            engine.enemy_spawn_delay, peak_enemies, peak_bullets, peak_enemy_bullets,
+            float(tick_ns.mean()), float(np.percentile(tick_ns, 95)), float(tick_ns.max()),
+            *(stage_totals[name] / max(tick, 1) / 1000 for name in STAGES))
+
+def parse_seeds(text):
+    seeds = []
+    for part in text.split(","):
+        if ":" in part:
+            start, stop = part.split(":")
+            seeds.extend(range(int(start), int(stop)))
+        else:
+            seeds.append(int(part))
+    return seeds
+
+def parse_sweep(settings):
+    sweep = {}
+    for setting in settings:
+        name, _, value = setting.partition("=")
+        if not value:
+            raise ValueError(f"expected NAME=VALUE, got {setting!r}")
+        sweep.setdefault(name, []).append(json.loads(value))
+    names = list(sweep)
+    return [dict(zip(names, values)) for values in itertools.product(*(sweep[name] for name in names))]
+
+def build_sessions(seeds, characters, scripts, configs, ticks):
+    sessions = []
+    for config_index, config in enumerate(configs):
+        for character in characters:
+            for script in scripts:
+                for seed in seeds:
+                    sessions.append((len(sessions), seed, character, script, config_index, config, ticks))
+    return sessions
+
+def run_batch(sessions, workers=None, progress=None):
+    results = [None] * len(sessions)
+    jobs = [(index, seed, character, script, config, ticks)
+            for index, seed, character, script, _, config, ticks in sessions]
+    chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for done, row in enumerate(executor.map(run_session, jobs, chunksize=chunksize), 1):
+            results[row[0]] = row[1:]
+            if progress is not None:
+                progress(done, len(jobs))
+    return results
+
+def config_columns(configs):
+    columns = {}
+    for name in dict.fromkeys(name for config in configs for name in config):
+        values = [config.get(name) for config in configs]
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            columns[name] = np.array(values, dtype=np.float64)
+        else:
+            columns[name] = np.array([json.dumps(value) for value in values])
+    return columns
+
+def collect_columns(sessions, results, configs):
+    columns = {
+        "session": np.array([session[0] for session in sessions], dtype=np.int64),
+        "seed": np.array([session[1] for session in sessions], dtype=np.int64),
+        "character": np.array([session[2] for session in sessions]),
+        "script": np.array([session[3] for session in sessions]),
+        "config": np.array([session[4] for session in sessions], dtype=np.int64),
+    }
+    for i, name in enumerate(RESULT_COLUMNS):
+        values = [row[i] for row in results]
+        if name == "game_over":
+            columns[name] = np.array(values, dtype=bool)
+        elif name in INT_COLUMNS:
+            columns[name] = np.array(values, dtype=np.int64)
+        else:
+            columns[name] = np.array(values, dtype=np.float64)
+    for name, values in config_columns(configs).items():
+        columns[name] = values[columns["config"]]
+    return columns
+
+def write_results(path, columns):
+    if os.path.splitext(path)[1].lower() == ".csv":
+        names = list(columns)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(zip(*(columns[name].tolist() for name in names)))
+    else:
+        np.savez_compressed(path, **columns)
+
+def load_results(path):
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        return {name: [row[i] for row in rows[1:]] for i, name in enumerate(rows[0])}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+def summarize(columns):
+    lines = []
+    groups = {}
+    for i in range(len(columns["session"])):
+        key = (int(columns["config"][i]), str(columns["character"][i]), str(columns["script"][i]))
+        groups.setdefault(key, []).append(i)
+    lines.append(f"{'config':>6} {'character':<10}{'script':<8}{'runs':>6}{'survived':>10}{'ticks':>9}"
+                 f"{'score':>9}{'peak enemies':>14}{'tick us':>9}")
+    for (config, character, script), rows in sorted(groups.items()):
+        rows = np.array(rows)
+        survived = 1 - columns["game_over"][rows].mean()
+        lines.append(f"{config:>6} {character:<10}{script:<8}{len(rows):>6}{survived:>10.1%}"
+                     f"{columns['ticks'][rows].mean():>9.0f}{columns['score'][rows].mean():>9.0f}"
+                     f"{columns['peak_enemies'][rows].mean():>14.1f}{columns['tick_mean_us'][rows].mean():>9.1f}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many headless sessions across a process pool.")
+    parser.add_argument("--seeds", default="0:100", help="comma-separated seeds or START:STOP ranges")
+    parser.add_argument("--characters", default="normal",
+                        help=f"comma-separated subset of {','.join(PLAYER_TYPES)}")
+    parser.add_argument("--scripts", default="bot", help=f"comma-separated subset of {','.join(INPUTS)}")
+    parser.add_argument("--ticks", type=int, default=36000, help="tick limit per session")
+    parser.add_argument("--set", dest="settings", action="append", default=[], metavar="NAME=VALUE",
+                        help="engine tunable or player.STAT, JSON value; repeat a name to sweep it")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default="batch_results.npz", help=".npz (columnar) or .csv")
+    args = parser.parse_args()
+    
+    characters = args.characters.split(",")
+    scripts = args.scripts.split(",")
+    for character in characters:
+        if character not in PLAYER_TYPES:
+            parser.error(f"unknown character: {character}")
+    for script in scripts:
+        if script not in INPUTS:
+            parser.error(f"unknown script: {script}")
+    try:
+        configs = parse_sweep(args.settings)
+        for config in configs:
+            check_config(config)
+    except ValueError as error:
+        parser.error(str(error))
+    
+    sessions = build_sessions(parse_seeds(args.seeds), characters, scripts, configs, args.ticks)
+
+    def progress(done, total):
+        if done == total or done % max(1, total // 20) == 0:
+            print(f"\r{done}/{total} sessions", end="", file=sys.stderr, flush=True)
+    
+    start = time.perf_counter()
+    results = run_batch(sessions, args.workers, progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+    
+    columns = collect_columns(sessions, results, configs)
+    write_results(args.out, columns)
+    print(summarize(columns))
+    print(f"{len(sessions)} sessions in {elapsed:.1f}s, results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
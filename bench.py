@@ -0,0 +1,248 @@
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import tracemalloc
+from time import perf_counter_ns
+from enemy import *
+from player import create_player
+from pool import release, release_all
+from projectile import WIDTH, HEIGHT, Bullet, LaserBeam, Missile
+from projectile_store import ProjectileStore
+from missiles import HomingMissiles
+from steering import FlockSteering
+
+BASELINE_PATH = "bench_baseline.json"
+INPUTS = 512
+
+def random_point(rng, margin=0):
+    return rng.uniform(-margin, WIDTH + margin), rng.uniform(-margin, HEIGHT + margin)
+
+def random_enemies(rng, count=INPUTS):
+    kinds = (Enemy, FastEnemy, TankEnemy, SwarmEnemy)
+    return [rng.choice(kinds)(*random_point(rng, 50)) for _ in range(count)]
+
+def random_lasers(rng, count=INPUTS):
+    return [LaserBeam(*random_point(rng), *random_point(rng, 100)) for _ in range(count)]
+
+def bench_laser_collision(rng):
+    lasers = random_lasers(rng)
+    enemies = random_enemies(rng)
+    check = LaserBeam.check_circle_collision
+    return check, [(laser, enemy.x, enemy.y, enemy.radius) for laser, enemy in zip(lasers, enemies)]
+
+def bench_laser_edge(rng):
+    laser = random_lasers(rng, 1)[0]
+    edge = LaserBeam.calculate_screen_edge_intersection
+    return edge, [(laser, *random_point(rng), rng.uniform(-math.pi, math.pi)) for _ in range(INPUTS)]
+
+def bench_missile_update(rng):
+    enemies = random_enemies(rng)
+    missiles = [Missile(*random_point(rng), enemy) for enemy in enemies]
+    return Missile.update, [(missile,) for missile in missiles]
+
+def bench_missile_step(count):
+    def setup(rng):
+        table = HomingMissiles()
+        for enemy in random_enemies(rng, count):
+            table.add(Missile(*random_point(rng), enemy))
+        return table.step, [()]
+    return setup
+
+def bench_enemy_update(rng):
+    player = create_player("normal", WIDTH // 2, HEIGHT // 2)
+    return Enemy.update, [(enemy, player) for enemy in random_enemies(rng)]
+
+def missile_shoot(player, enemies):
+    player.fire_cooldown = 0
+    for projectile in player.shoot(enemies):
+        release(projectile)
+
+def bench_missile_shoot(rng):
+    inputs = []
+    for _ in range(64):
+        player = create_player("missile", *random_point(rng))
+        inputs.append((player, random_enemies(rng, 50)))
+    return missile_shoot, inputs
+
+def spawn_and_release(rng):
+    release(spawn_enemy(None, rng))
+
+def bench_spawn_enemy(rng):
+    return spawn_and_release, [(rng,)] * INPUTS
+
+def spawn_wave_and_release(rng):
+    release_all(spawn_wave(64, rng))
+
+def bench_spawn_wave(rng):
+    return spawn_wave_and_release, [(rng,)] * 16
+
+def bench_flock(count, warmup=200):
+    def setup(rng):
+        player = create_player("normal", WIDTH // 2, HEIGHT // 2)
+        table = FlockSteering()
+        for _ in range(count):
+            table.add(SwarmEnemy(*random_point(rng, 50)))
+        for _ in range(warmup):
+            table.step(player)
+        return table.step, [(player,)]
+    return setup
+
+def bench_get_rect(make):
+    def setup(rng):
+        objects = make(rng)
+        return objects[0].get_rect.__func__, [(obj,) for obj in objects]
+    return setup
+
+def random_views(rng):
+    store = ProjectileStore(WIDTH, HEIGHT)
+    for _ in range(INPUTS):
+        store.add(*random_point(rng), rng.uniform(-5, 5), rng.uniform(-5, 5), 10, 5, (255, 255, 0))
+    return list(store)
+
+BENCHMARKS = {
+    "LaserBeam.check_circle_collision": bench_laser_collision,
+    "LaserBeam.calculate_screen_edge_intersection": bench_laser_edge,
+    "Missile.update": bench_missile_update,
+    "HomingMissiles.step[15 missiles]": bench_missile_step(15),
+    "HomingMissiles.step[200 missiles]": bench_missile_step(200),
+    "Enemy.update": bench_enemy_update,
+    "MissilePlayer.shoot[50 enemies]": bench_missile_shoot,
+    "spawn_enemy": bench_spawn_enemy,
+    "spawn_wave[64 enemies]": bench_spawn_wave,
+    "FlockSteering.step[250 boids]": bench_flock(250),
+    "FlockSteering.step[500 boids]": bench_flock(500),
+    "FlockSteering.step[1000 boids]": bench_flock(1000),
+    "FlockSteering.step[2000 boids]": bench_flock(2000),
+    "Bullet.get_rect": bench_get_rect(lambda rng: [Bullet(*random_point(rng), 0.5) for _ in range(INPUTS)]),
+    "EnemyBullet.get_rect": bench_get_rect(lambda rng: [EnemyBullet(*random_point(rng), 0.5) for _ in range(INPUTS)]),
+    "LaserBeam.get_rect": bench_get_rect(random_lasers),
+    "Missile.get_rect": bench_get_rect(lambda rng: [Missile(*random_point(rng), enemy) for enemy in random_enemies(rng)]),
+    "Enemy.get_rect": bench_get_rect(random_enemies),
+    "BossEnemy.get_rect": bench_get_rect(lambda rng: [BossEnemy(*random_point(rng)) for _ in range(INPUTS)]),
+    "Player.get_rect": bench_get_rect(lambda rng: [create_player("normal", *random_point(rng)) for _ in range(INPUTS)]),
+    "ProjectileView.get_rect": bench_get_rect(random_views),
+}
+
+def time_batch(fn, inputs, loops):
+    start = perf_counter_ns()
+    for _ in range(loops):
+        for args in inputs:
+            fn(*args)
+    return perf_counter_ns() - start
+
+def measure(fn, inputs, repeat=7, target_ns=10_000_000):
+    loops = 1
+    while True:
+        elapsed = time_batch(fn, inputs, loops)
+        if elapsed >= target_ns // 4:
+            break
+        loops *= 4
+    loops = max(1, loops * target_ns // max(elapsed, 1))
+    
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        best = min(time_batch(fn, inputs, loops) for _ in range(repeat))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best / (loops * len(inputs))
+
+def measure_allocations(fn, inputs):
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        peak_bytes = 0
+        for args in inputs:
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn(*args)
+            peak_bytes += tracemalloc.get_traced_memory()[1] - current
+        
+        blocks = sys.getallocatedblocks()
+        for args in inputs:
+            fn(*args)
+        retained = sys.getallocatedblocks() - blocks
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return peak_bytes / len(inputs), max(retained, 0) / len(inputs)
+
+def run(names, seed=0, repeat=7):
+    results = {}
+    for name in names:
+        fn, inputs = BENCHMARKS[name](random.Random(f"{seed}:{name}"))
+        ns = measure(fn, inputs, repeat)
+        fn, inputs = BENCHMARKS[name](random.Random(f"{seed}:{name}"))
+        alloc_bytes, retained = measure_allocations(fn, inputs)
+        results[name] = {
+            "ns_per_op": round(ns, 1),
+            "alloc_bytes_per_op": round(alloc_bytes, 1),
+            "retained_blocks_per_op": round(retained, 2),
+        }
+    return results
+
+def compare(baseline, results, threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ns_per_op"] > base["ns_per_op"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for entity hot paths.")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown in ns/op")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+    
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return
+    
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    except FileNotFoundError:
+        baseline = {}
+    
+    results = run(names, args.seed, args.repeat)
+    regressions = compare(baseline, results, args.threshold)
+    
+    print(f"{'benchmark':<46}{'ns/op':>10}{'baseline':>10}{'change':>9}{'alloc B/op':>12}{'blocks/op':>11}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            base_text, change_text = "-", "-"
+        else:
+            base_text = f"{base['ns_per_op']:.1f}"
+            change_text = f"{result['ns_per_op'] / base['ns_per_op'] - 1:+.1%}"
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<46}{result['ns_per_op']:>10.1f}{base_text:>10}{change_text:>9}"
+              f"{result['alloc_bytes_per_op']:>12.1f}{result['retained_blocks_per_op']:>11.2f}{flag}")
+    
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "results": baseline}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) past {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import pygame
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+GRID_SPACING = 100
+GRID_COLOR = (30, 30, 30)
+BORDER_COLOR = (90, 90, 90)
+
+def parse_size(text, default):
+    if not text:
+        return default
+    width, height = text.lower().split("x")
+    return max(int(width), SCREEN_WIDTH), max(int(height), SCREEN_HEIGHT)
+
+WORLD_WIDTH, WORLD_HEIGHT = parse_size(os.environ.get("SHOOTER_WORLD"), (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+class Camera:
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, world_width=WORLD_WIDTH, world_height=WORLD_HEIGHT):
+        self.width = width
+        self.height = height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def scrolls(self):
+        return self.world_width > self.width or self.world_height > self.height
+
+    def origin(self, x, y):
+        return (int(max(0, min(self.world_width - self.width, x - self.width / 2))),
+                int(max(0, min(self.world_height - self.height, y - self.height / 2))))
+
+    def follow(self, x, y):
+        self.x, self.y = self.origin(x, y)
+
+    def view(self, margin=0):
+        return self.x - margin, self.y - margin, self.x + self.width + margin, self.y + self.height + margin
+
+    def area_around(self, x, y):
+        left, top = self.origin(x, y)
+        return left, top, left + self.width, top + self.height
+
+    def sees(self, x, y, reach):
+        return (self.x - reach <= x <= self.x + self.width + reach and
+                self.y - reach <= y <= self.y + self.height + reach)
+
+    def to_world(self, pos):
+        return pos[0] + self.x, pos[1] + self.y
+
+    def shift(self, entities):
+        ox = self.x
+        oy = self.y
+        saved = []
+        for entity in entities:
+            saved.append((entity, entity.x, entity.y))
+            entity.x -= ox
+            entity.y -= oy
+        return saved
+
+    def shift_segments(self, segments):
+        ox = self.x
+        oy = self.y
+        saved = []
+        for segment in segments:
+            saved.append((segment, segment.end_x, segment.end_y))
+            segment.end_x -= ox
+            segment.end_y -= oy
+        return saved
+
+    def restore(self, saved):
+        for entity, x, y in saved:
+            entity.x = x
+            entity.y = y
+
+    def restore_segments(self, saved):
+        for segment, end_x, end_y in saved:
+            segment.end_x = end_x
+            segment.end_y = end_y
+
+    def draw_grid(self, surface):
+        left = -(self.x % GRID_SPACING)
+        top = -(self.y % GRID_SPACING)
+        for x in range(left, self.width, GRID_SPACING):
+            pygame.draw.line(surface, GRID_COLOR, (x, 0), (x, self.height))
+        for y in range(top, self.height, GRID_SPACING):
+            pygame.draw.line(surface, GRID_COLOR, (0, y), (self.width, y))
+        pygame.draw.rect(surface, BORDER_COLOR, (-self.x, -self.y, self.world_width, self.world_height), 2)
@@ -0,0 +1,74 @@
+import pygame
+
+DIRTY_THRESHOLD = 0.4
+MAX_DIRTY_RECTS = 600
+
+class FullRenderer:
+    tracks_rects = False
+
+    def __init__(self, screen, background=(0, 0, 0)):
+        self.screen = screen
+        self.background = background
+        self.static_key = None
+
+    def static_changed(self, key):
+        if key == self.static_key:
+            return False
+        self.static_key = key
+        return True
+
+    def clear(self):
+        self.static_key = None
+        self.screen.fill(self.background)
+
+    def flip(self):
+        pygame.display.flip()
+
+    def present(self, rects):
+        pygame.display.flip()
+
+class DirtyRenderer:
+    tracks_rects = True
+
+    def __init__(self, screen, background=(0, 0, 0), threshold=DIRTY_THRESHOLD, max_rects=MAX_DIRTY_RECTS):
+        self.screen = screen
+        self.background = background
+        self.max_area = screen.get_width() * screen.get_height() * threshold
+        self.max_rects = max_rects
+        self.previous = []
+        self.full = True
+        self.static_key = None
+        self.full_frames = 0
+        self.dirty_frames = 0
+
+    def static_changed(self, key):
+        if key == self.static_key:
+            return False
+        self.static_key = key
+        return True
+
+    def clear(self):
+        self.static_key = None
+        screen = self.screen
+        background = self.background
+        if self.full:
+            screen.fill(background)
+        else:
+            for rect in self.previous:
+                screen.fill(background, rect)
+
+    def flip(self):
+        pygame.display.flip()
+        self.previous = []
+        self.full = True
+
+    def present(self, rects):
+        dirty = self.previous + rects
+        if self.full or len(dirty) > self.max_rects or sum(w * h for _, _, w, h in dirty) > self.max_area:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.dirty_frames += 1
+        self.previous = rects
+        self.full = False
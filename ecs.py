@@ -0,0 +1,73 @@
+import numpy as np
+
+class Table:
+    columns = ()
+    flags = ()
+    attributes = ()
+
+    def __init__(self, capacity=64):
+        self.entities = []
+        self.rows = {}
+        self.count = 0
+        for name in self.columns:
+            setattr(self, name, np.zeros(capacity))
+        for name in self.flags + ("alive",):
+            setattr(self, name, np.zeros(capacity, dtype=bool))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, entity):
+        return entity in self.rows
+
+    def _grow(self, needed):
+        capacity = max(needed, len(self.alive) * 2)
+        for name in self.columns + self.flags + ("alive",):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, entity):
+        i = self.count
+        if i >= len(self.alive):
+            self._grow(i + 1)
+        self.entities.append(entity)
+        self.rows[entity] = i
+        for name in self.attributes:
+            getattr(self, name)[i] = getattr(entity, name)
+        self.load(entity, i)
+        self.alive[i] = True
+        self.count = i + 1
+        return i
+
+    def load(self, entity, i):
+        pass
+
+    def discard(self, entity):
+        i = self.rows.pop(entity, None)
+        if i is not None:
+            self.alive[i] = False
+
+    def clear(self):
+        self.entities = []
+        self.rows = {}
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def compact(self):
+        n = self.count
+        if len(self.rows) == n:
+            return
+        keep = np.flatnonzero(self.alive[:n])
+        k = len(keep)
+        if k == n:
+            return
+        for name in self.columns + self.flags:
+            values = getattr(self, name)
+            values[:k] = values[keep]
+        self.alive[:k] = True
+        self.alive[k:n] = False
+        self.entities = [self.entities[i] for i in keep.tolist()]
+        self.rows = {entity: i for i, entity in enumerate(self.entities)}
+        self.count = k
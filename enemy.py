@@ -1,6 +1,12 @@
 import pygame
+import json
 import math
+import os
 import random
+from itertools import count
+from types import MappingProxyType
+from camera import WORLD_WIDTH, WORLD_HEIGHT
+from pool import acquire
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -13,142 +19,115 @@ PURPLE = (128, 0, 128)
 CYAN = (0, 255, 255)
 GRAY = (128, 128, 128)
 
+_spawn_ids = count()
+
 class Enemy:
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "health", "spawn_id", "ai_slot", "alive")
+    kind = "normal"
+    behavior = "chase"
+    components = ("chase",)
+    standoff = 0
+    outline = None
+    health_bar = None
+    spawn_at = None
+    stats = None
+
+    def __init__(self, x, y, rng=None):
         self.x = x
         self.y = y
-        self.radius = 15
-        self.speed = 3
-        self.color = RED
-        self.health = 30
-        self.max_health = 30
-        self.score_value = 10
-        self.damage = 10
-
-    def update(self, player):
+        self.spawn_id = next(_spawn_ids)
+        self.ai_slot = 0
+        self.alive = True
+        self.health = self.max_health
+
+    def update(self, player, emitter=None, awake=True):
+        distance = self.chase(player)
+        self.act(player, distance, emitter, awake)
+
+    def chase(self, player):
         dx = player.x - self.x
         dy = player.y - self.y
         distance = math.sqrt(dx**2 + dy**2)
         
-        if distance > 0:
+        if distance > self.standoff:
             self.x += (dx / distance) * self.speed
             self.y += (dy / distance) * self.speed
+        return distance
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+    def act(self, player, distance, emitter, awake=True):
+        pass
+
+    def draw(self, screen, detail=True):
+        center = (int(self.x), int(self.y))
+        pygame.draw.circle(screen, self.color, center, self.radius)
+        if not detail:
+            return
+        if self.outline is not None:
+            inset, width = self.outline
+            pygame.draw.circle(screen, BLACK, center, self.radius - inset, width)
+        
+        if self.health_bar is not None:
+            bar_width, bar_height, offset, color = self.health_bar
+            health_percentage = self.health / self.max_health
+            bar_x = self.x - bar_width // 2
+            bar_y = self.y - self.radius - offset
+            pygame.draw.rect(screen, GRAY, (bar_x, bar_y, bar_width, bar_height))
+            pygame.draw.rect(screen, color, (bar_x, bar_y, bar_width * health_percentage, bar_height))
 
     def get_rect(self):
         return pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius * 2, self.radius * 2)
 
 class FastEnemy(Enemy):
-    def __init__(self, x, y):
-        super().__init__(x, y)
-        self.radius = 12
-        self.speed = 6
-        self.color = ORANGE
-        self.health = 15
-        self.max_health = 15
-        self.score_value = 15
-        self.damage = 5
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius, 2)
+    __slots__ = ()
+    kind = "fast"
 
 class TankEnemy(Enemy):
-    def __init__(self, x, y):
-        super().__init__(x, y)
-        self.radius = 25
-        self.speed = 1.5
-        self.color = PURPLE
-        self.health = 100
-        self.max_health = 100
-        self.score_value = 30
-        self.damage = 20
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius - 5, 3)
-        
-        health_percentage = self.health / self.max_health
-        bar_width = 40
-        bar_height = 5
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - self.radius - 10
-        pygame.draw.rect(screen, GRAY, (bar_x, bar_y, bar_width, bar_height))
-        pygame.draw.rect(screen, GREEN, (bar_x, bar_y, bar_width * health_percentage, bar_height))
+    __slots__ = ()
+    kind = "tank"
 
 class ShooterEnemy(Enemy):
-    def __init__(self, x, y):
+    __slots__ = ("shoot_cooldown",)
+    kind = "shooter"
+    behavior = "shooter"
+    components = ("chase", "shooter")
+    scripted_attack = False
+
+    def __init__(self, x, y, rng=None):
         super().__init__(x, y)
-        self.radius = 18
-        self.speed = 2
-        self.color = CYAN
-        self.health = 40
-        self.max_health = 40
-        self.score_value = 20
-        self.damage = 10
         self.shoot_cooldown = 0
-        self.shoot_delay = 120
-        self.bullets = []
 
-    def update(self, player):
-        dx = player.x - self.x
-        dy = player.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        if distance > 200:
-            if distance > 0:
-                self.x += (dx / distance) * self.speed
-                self.y += (dy / distance) * self.speed
-        
+    def act(self, player, distance, emitter, awake=True):
         self.shoot_cooldown -= 1
-        if self.shoot_cooldown <= 0 and distance <= 400:
-            self.shoot(player)
+        if self.shoot_cooldown <= 0 and distance <= self.shoot_range and awake:
+            self.shoot(player, emitter)
             self.shoot_cooldown = self.shoot_delay
 
-    def shoot(self, player):
+    def shoot(self, player, emitter):
         dx = player.x - self.x
         dy = player.y - self.y
         angle = math.atan2(dy, dx)
-        bullet = EnemyBullet(self.x, self.y, angle)
-        self.bullets.append(bullet)
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius - 3, 2)
-        
-        for bullet in self.bullets:
-            bullet.draw(screen)
-
-    def update_bullets(self):
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
+        emitter.emit(self.x, self.y, angle, self.spawn_id)
 
 class WanderingEnemy(Enemy):
-    def __init__(self, x, y):
+    __slots__ = ("change_direction_timer", "target_x", "target_y", "rng")
+    kind = "wandering"
+    behavior = "wander"
+    components = ("wander",)
+
+    def __init__(self, x, y, rng=None):
         super().__init__(x, y)
-        self.radius = 16
-        self.speed = 2.5
-        self.color = YELLOW
-        self.health = 25
-        self.max_health = 25
-        self.score_value = 12
-        self.damage = 8
         self.change_direction_timer = 0
-        self.change_direction_delay = 60
         self.target_x = x
         self.target_y = y
+        self.rng = rng or random
 
-    def update(self, player):
+    def update(self, player, emitter=None, awake=True):
         self.change_direction_timer -= 1
         
-        if self.change_direction_timer <= 0:
+        if self.change_direction_timer <= 0 and awake:
             self.change_direction_timer = self.change_direction_delay
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(50, 150)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            distance = self.rng.uniform(50, 150)
             self.target_x = self.x + math.cos(angle) * distance
             self.target_y = self.y + math.sin(angle) * distance
         
@@ -160,61 +139,46 @@ class WanderingEnemy(Enemy):
             self.x += (dx / distance) * self.speed
             self.y += (dy / distance) * self.speed
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius - 4, 2)
-
 class SwarmEnemy(Enemy):
-    def __init__(self, x, y):
+    __slots__ = ("vx", "vy")
+    kind = "swarm"
+    behavior = "flock"
+    components = ("flock",)
+
+    def __init__(self, x, y, rng=None):
         super().__init__(x, y)
-        self.radius = 10
-        self.speed = 4
-        self.color = GREEN
-        self.health = 10
-        self.max_health = 10
-        self.score_value = 5
-        self.damage = 3
+        self.vx = 0.0
+        self.vy = 0.0
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius, 1)
+    def update(self, player, emitter=None, awake=True):
+        pass
 
 class BossEnemy(Enemy):
-    def __init__(self, x, y):
+    __slots__ = ("speed", "shoot_cooldown", "shoot_delay", "phase", "special_attack_cooldown")
+    kind = "boss"
+    behavior = "boss"
+    components = ("chase", "shooter")
+    shoot_range = math.inf
+    scripted_attack = True
+
+    def __init__(self, x, y, rng=None):
         super().__init__(x, y)
-        self.radius = 40
-        self.speed = 1
-        self.color = (139, 0, 0)
-        self.health = 300
-        self.max_health = 300
-        self.score_value = 100
-        self.damage = 30
+        self.speed = self.stats["speed"]
         self.shoot_cooldown = 0
-        self.shoot_delay = 60
-        self.bullets = []
+        self.shoot_delay = self.stats["shoot_delay"]
         self.phase = 1
         self.special_attack_cooldown = 0
-        self.special_attack_delay = 180
 
-    def update(self, player):
-        dx = player.x - self.x
-        dy = player.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        if distance > 300:
-            if distance > 0:
-                self.x += (dx / distance) * self.speed
-                self.y += (dy / distance) * self.speed
-        
+    def act(self, player, distance, emitter, awake=True):
         self.shoot_cooldown -= 1
         self.special_attack_cooldown -= 1
         
         if self.shoot_cooldown <= 0:
-            self.shoot(player)
+            self.shoot(player, emitter)
             self.shoot_cooldown = self.shoot_delay
         
         if self.special_attack_cooldown <= 0:
-            self.special_attack()
+            self.special_attack(emitter)
             self.special_attack_cooldown = self.special_attack_delay
         
         if self.health < self.max_health * 0.5:
@@ -222,48 +186,26 @@ class BossEnemy(Enemy):
             self.shoot_delay = 40
             self.speed = 1.5
 
-    def shoot(self, player):
+    def shoot(self, player, emitter):
         dx = player.x - self.x
         dy = player.y - self.y
         angle = math.atan2(dy, dx)
         
         if self.phase == 1:
-            bullet = EnemyBullet(self.x, self.y, angle)
-            self.bullets.append(bullet)
+            emitter.emit(self.x, self.y, angle, self.spawn_id)
         else:
             for i in range(3):
                 offset_angle = angle + (i - 1) * 0.3
-                bullet = EnemyBullet(self.x, self.y, offset_angle)
-                self.bullets.append(bullet)
+                emitter.emit(self.x, self.y, offset_angle, self.spawn_id)
 
-    def special_attack(self):
+    def special_attack(self, emitter):
         for i in range(8):
             angle = (i / 8) * 2 * math.pi
-            bullet = EnemyBullet(self.x, self.y, angle)
-            self.bullets.append(bullet)
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius - 5, 4)
-        
-        health_percentage = self.health / self.max_health
-        bar_width = 80
-        bar_height = 8
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - self.radius - 15
-        pygame.draw.rect(screen, GRAY, (bar_x, bar_y, bar_width, bar_height))
-        pygame.draw.rect(screen, RED, (bar_x, bar_y, bar_width * health_percentage, bar_height))
-        
-        for bullet in self.bullets:
-            bullet.draw(screen)
-
-    def update_bullets(self):
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
+            emitter.emit(self.x, self.y, angle, self.spawn_id)
 
 class EnemyBullet:
+    __slots__ = ("x", "y", "radius", "speed", "angle", "dx", "dy", "color", "damage")
+
     def __init__(self, x, y, angle):
         self.x = x
         self.y = y
@@ -283,41 +225,193 @@ class EnemyBullet:
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
 
     def is_off_screen(self):
-        return (self.x < 0 or self.x > 800 or 
-                self.y < 0 or self.y > 600)
+        return (self.x < 0 or self.x > WORLD_WIDTH or
+                self.y < 0 or self.y > WORLD_HEIGHT)
 
     def get_rect(self):
         return pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius * 2, self.radius * 2)
 
-def spawn_enemy(enemy_type=None):
-    side = random.choice(['top', 'bottom', 'left', 'right'])
+class BulletEmitter:
+    def __init__(self, store, speed=5, radius=4, damage=5, color=WHITE):
+        self.store = store
+        self.speed = speed
+        self.radius = radius
+        self.damage = damage
+        self.color = color
+
+    def emit(self, x, y, angle, owner):
+        dx = math.cos(angle) * self.speed
+        dy = math.sin(angle) * self.speed
+        x += dx
+        y += dy
+        min_x, min_y, max_x, max_y = self.store.bounds
+        if x < min_x or x > max_x or y < min_y or y > max_y:
+            return None
+        return self.store.add(x, y, dx, dy, self.damage, self.radius, self.color, owner)
+
+ENEMY_TABLE = {
+    "normal": {"behavior": "chase", "radius": 15, "speed": 3, "color": RED, "health": 30, "score": 10, "damage": 10},
+    "fast": {"behavior": "chase", "radius": 12, "speed": 6, "color": ORANGE, "health": 15, "score": 15, "damage": 5,
+             "outline": (0, 2)},
+    "tank": {"behavior": "chase", "radius": 25, "speed": 1.5, "color": PURPLE, "health": 100, "score": 30,
+             "damage": 20, "outline": (5, 3), "health_bar": (40, 5, 10, GREEN)},
+    "shooter": {"behavior": "shooter", "radius": 18, "speed": 2, "color": CYAN, "health": 40, "score": 20,
+                "damage": 10, "outline": (3, 2), "standoff": 200, "shoot_delay": 120, "shoot_range": 400},
+    "wandering": {"behavior": "wander", "radius": 16, "speed": 2.5, "color": YELLOW, "health": 25, "score": 12,
+                  "damage": 8, "outline": (4, 2), "change_direction_delay": 60},
+    "swarm": {"behavior": "flock", "radius": 10, "speed": 4, "color": GREEN, "health": 10, "score": 5, "damage": 3,
+              "outline": (0, 1)},
+    "boss": {"behavior": "boss", "radius": 40, "speed": 1, "color": (139, 0, 0), "health": 300, "score": 100,
+             "damage": 30, "outline": (5, 4), "health_bar": (80, 8, 15, RED), "standoff": 300, "shoot_delay": 60,
+             "special_attack_delay": 180, "weight": 0, "spawn_at": (400, -50)},
+}
+
+BEHAVIORS = {
+    "chase": Enemy,
+    "shooter": ShooterEnemy,
+    "wander": WanderingEnemy,
+    "flock": SwarmEnemy,
+    "boss": BossEnemy,
+}
+
+BUILTIN_TYPES = {cls.kind: cls for cls in (Enemy, FastEnemy, TankEnemy, ShooterEnemy, WanderingEnemy, SwarmEnemy,
+                                           BossEnemy)}
+
+RENAMED_STATS = {"health": "max_health", "score": "score_value"}
+REQUIRED_STATS = {
+    "chase": (),
+    "shooter": ("shoot_delay", "shoot_range"),
+    "wander": ("change_direction_delay",),
+    "flock": (),
+    "boss": ("shoot_delay", "special_attack_delay"),
+}
+OPTIONAL_STATS = {"outline": None, "health_bar": None, "standoff": 0, "spawn_at": None}
+TABLE_KEYS = ("behavior", "weight")
+
+SIDES = ['top', 'bottom', 'left', 'right']
+
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def load_enemy_table(path):
+    if os.path.splitext(path)[1].lower() == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _slots(cls):
+    return {name for klass in cls.__mro__ for name in getattr(klass, "__slots__", ())}
+
+def _compile(name, entry):
+    behavior = entry.get("behavior", "chase")
+    if behavior not in BEHAVIORS:
+        raise ValueError(f"enemy type {name!r}: unknown behavior {behavior!r}")
+    stats = dict(OPTIONAL_STATS)
+    stats.update((RENAMED_STATS.get(key, key), _freeze(value)) for key, value in entry.items()
+                 if key not in TABLE_KEYS)
+    missing = {"radius", "speed", "color", "max_health", "score_value", "damage",
+               *REQUIRED_STATS[behavior]} - stats.keys()
+    if missing:
+        raise ValueError(f"enemy type {name!r}: missing {', '.join(sorted(missing))}")
+    return behavior, MappingProxyType(stats)
+
+def _class_stats(cls, stats):
+    slots = _slots(cls)
+    namespace = {key: value for key, value in stats.items() if key not in slots}
+    namespace["stats"] = stats
+    return namespace
+
+for _name, _cls in BUILTIN_TYPES.items():
+    for _key, _value in _class_stats(_cls, _compile(_name, ENEMY_TABLE[_name])[1]).items():
+        setattr(_cls, _key, _value)
+
+class EnemyRegistry:
+    def __init__(self, table):
+        self.types = {}
+        self.stats = {}
+        for name, entry in table.items():
+            behavior, stats = _compile(name, entry)
+            base = BUILTIN_TYPES.get(name)
+            if base is None or base.behavior != behavior:
+                base = BEHAVIORS[behavior]
+                class_name = "".join(part.capitalize() for part in name.split("_")) + "Enemy"
+            else:
+                class_name = base.__name__
+            namespace = _class_stats(base, stats)
+            namespace.update(__slots__=(), kind=name, behavior=behavior)
+            self.types[name] = type(class_name, (base,), namespace)
+            self.stats[name] = stats
+        
+        self.spawn_types = [name for name, entry in table.items() if entry.get("weight", 1) > 0]
+        self.spawn_weights = [table[name].get("weight", 1) for name in self.spawn_types]
+        self.uniform = len(set(self.spawn_weights)) <= 1
+
+    def create(self, enemy_type, x, y, rng=None, origin=(0, 0)):
+        cls = self.types[enemy_type]
+        if cls.spawn_at is not None:
+            x = origin[0] + cls.spawn_at[0]
+            y = origin[1] + cls.spawn_at[1]
+        return acquire(cls, x, y, rng)
+
+    def pick(self, rng, weights=None):
+        if weights is None:
+            if self.uniform:
+                return rng.choice(self.spawn_types)
+            weights = self.spawn_weights
+        return rng.choices(self.spawn_types, weights)[0]
+
+ENEMY_REGISTRY = EnemyRegistry(load_enemy_table(os.environ["SHOOTER_ENEMIES"])
+                               if os.environ.get("SHOOTER_ENEMIES") else ENEMY_TABLE)
+SPAWN_TYPES = ENEMY_REGISTRY.spawn_types
+
+def spawn_enemy(enemy_type=None, rng=random, ai_rng=None, weights=None, area=None):
+    left, top, right, bottom = area or (0, 0, WORLD_WIDTH, WORLD_HEIGHT)
+    side = rng.choice(SIDES)
     if side == 'top':
-        x = random.randint(0, 800)
-        y = -50
+        x = rng.randint(left, right)
+        y = top - 50
     elif side == 'bottom':
-        x = random.randint(0, 800)
-        y = 650
+        x = rng.randint(left, right)
+        y = bottom + 50
     elif side == 'left':
-        x = -50
-        y = random.randint(0, 600)
+        x = left - 50
+        y = rng.randint(top, bottom)
     else:
-        x = 850
-        y = random.randint(0, 600)
+        x = right + 50
+        y = rng.randint(top, bottom)
     
     if enemy_type is None:
-        enemy_type = random.choice(['normal', 'fast', 'tank', 'shooter', 'wandering', 'swarm'])
-    
-    if enemy_type == 'normal':
-        return Enemy(x, y)
-    elif enemy_type == 'fast':
-        return FastEnemy(x, y)
-    elif enemy_type == 'tank':
-        return TankEnemy(x, y)
-    elif enemy_type == 'shooter':
-        return ShooterEnemy(x, y)
-    elif enemy_type == 'wandering':
-        return WanderingEnemy(x, y)
-    elif enemy_type == 'swarm':
-        return SwarmEnemy(x, y)
-    elif enemy_type == 'boss':
-        return BossEnemy(400, -50)
+        enemy_type = ENEMY_REGISTRY.pick(rng, weights)
+    return ENEMY_REGISTRY.create(enemy_type, x, y, ai_rng or rng, (left, top))
+
+def spawn_wave(count, rng=random, ai_rng=None, weights=None, types=None, area=None):
+    left, top, right, bottom = area or (0, 0, WORLD_WIDTH, WORLD_HEIGHT)
+    width = right - left + 1
+    height = bottom - top + 1
+    registry = ENEMY_REGISTRY
+    if types is None:
+        types = registry.spawn_types
+        if weights is None:
+            weights = registry.spawn_weights
+    kinds = rng.choices(types, weights, k=count)
+    sides = rng.choices(range(4), k=count)
+    ai_rng = ai_rng or rng
+    create = registry.create
+    origin = (left, top)
+    enemies = []
+    for kind, side in zip(kinds, sides):
+        offset = rng.random()
+        if side == 0:
+            enemy = create(kind, left + int(offset * width), top - 50, ai_rng, origin)
+        elif side == 1:
+            enemy = create(kind, left + int(offset * width), bottom + 50, ai_rng, origin)
+        elif side == 2:
+            enemy = create(kind, left - 50, top + int(offset * height), ai_rng, origin)
+        else:
+            enemy = create(kind, right + 50, top + int(offset * height), ai_rng, origin)
+        enemies.append(enemy)
+    return enemies
@@ -0,0 +1,551 @@
+import math
+import os
+import random
+import struct
+import zlib
+import numpy as np
+from time import perf_counter_ns
+from array import array
+from itertools import chain
+from camera import Camera
+from enemy import *
+from entities import EntityList
+from missiles import HomingMissiles
+from player import create_player, switch_character
+from pool import acquire, prewarm, release, release_all
+from projectile import WIDTH, HEIGHT, Bullet, LaserBeam, Missile
+from projectile_store import ProjectileStore
+from spatial import SpatialHash, nearest
+from sprites import WHITE, SpriteAtlas
+from steering import flock
+from world import EnemyWorld
+
+USE_SPATIAL_HASH = os.environ.get("SHOOTER_COLLISION", "grid") != "brute"
+USE_BATCH_STEERING = os.environ.get("SHOOTER_STEERING", "batch") != "scalar"
+USE_SPRITES = os.environ.get("SHOOTER_RENDER", "sprites") != "draw"
+USE_BATCH_MISSILES = os.environ.get("SHOOTER_MISSILES", "batch") != "scalar"
+ENEMY_BULLET_CAP = int(os.environ.get("SHOOTER_ENEMY_BULLET_CAP", 0)) or None
+
+POOL_PREWARM = (
+    (Bullet, 32),
+    (LaserBeam, 4),
+    (Missile, 16),
+)
+
+ENEMY_PREWARM = (
+    ("normal", 16),
+    ("fast", 16),
+    ("tank", 8),
+    ("shooter", 8),
+    ("wandering", 16),
+    ("swarm", 16),
+    ("boss", 1),
+)
+
+LASER_BATCH_MIN = 16
+RETARGET_RANGE = 500
+VIEW_MARGIN = 20
+
+TUNABLES = ("spawn_delay", "min_spawn_delay", "spawn_delay_decay", "spawn_weights")
+
+STAGES = ("input", "movement", "spawn", "enemy_update", "collisions", "cleanup")
+
+UPGRADE_ACTIONS = (
+    "upgrade_max_health",
+    "upgrade_speed",
+    "upgrade_bullet_speed",
+    "upgrade_bullet_damage",
+    "upgrade_fire_rate",
+)
+
+QUALITY_LEVELS = (
+    {"detail": True, "projectile_detail": True, "spawn_throttle": 1, "ai_slices": 1},
+    {"detail": False, "projectile_detail": True, "spawn_throttle": 1, "ai_slices": 1},
+    {"detail": False, "projectile_detail": False, "spawn_throttle": 1, "ai_slices": 1},
+    {"detail": False, "projectile_detail": False, "spawn_throttle": 1.5, "ai_slices": 1},
+    {"detail": False, "projectile_detail": False, "spawn_throttle": 1.5, "ai_slices": 4},
+)
+
+class KeySet:
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class FrameInput:
+    def __init__(self, keys, mouse_pos, mouse_held):
+        self.keys = keys
+        self.mouse_pos = mouse_pos
+        self.mouse_held = mouse_held
+
+class GameEngine:
+    spawn_delay = 60
+    min_spawn_delay = 20
+    spawn_delay_decay = 0.3
+    spawn_weights = None
+
+    def __init__(self, player=None, seed=None, recorder=None, tuning=None):
+        for name, value in (tuning or {}).items():
+            if name not in TUNABLES:
+                raise ValueError(f"unknown tuning parameter: {name!r}")
+            setattr(self, name, value)
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        self.spawn_rng = random.Random(f"{seed}:spawn")
+        self.ai_rng = random.Random(f"{seed}:ai")
+        self.recorder = recorder
+        self.timings = None
+        self.keep_previous = False
+        self.previous = {}
+        self.blended = None
+        for cls, size in POOL_PREWARM:
+            prewarm(cls, size)
+        for name, size in ENEMY_PREWARM:
+            if name in ENEMY_REGISTRY.types:
+                prewarm(ENEMY_REGISTRY.types[name], size)
+        
+        self.lasers = EntityList()
+        self.bullets = EntityList()
+        self.bullet_store = ProjectileStore(WIDTH, HEIGHT)
+        self.enemies = EntityList()
+        self.enemy_bullets = ProjectileStore(WIDTH, HEIGHT, limit=ENEMY_BULLET_CAP)
+        self.emitter = BulletEmitter(self.enemy_bullets)
+        self.enemy_grid = SpatialHash()
+        self.world = EnemyWorld()
+        self.missiles = HomingMissiles()
+        self.sprites = SpriteAtlas()
+        self.health_bars = {}
+        self.camera = Camera()
+        self.drawn = 0
+        self.reset(player)
+
+    def reset(self, player=None):
+        if player is None:
+            player = create_player("normal", WIDTH // 2, HEIGHT // 2)
+        self.player = player
+        self.camera.follow(player.x, player.y)
+        release_all(self.lasers)
+        self.lasers.clear()
+        release_all(self.bullets)
+        self.bullets.clear()
+        self.missiles.clear()
+        self.bullet_store.clear()
+        release_all(self.enemies)
+        self.enemies.clear()
+        self.enemy_grid.clear()
+        self.world.clear()
+        self.enemy_bullets.clear()
+        self.health_bars.clear()
+        self.previous.clear()
+        
+        self.tick = 0
+        self.spawned = 0
+        self.enemy_spawn_timer = 0
+        self.enemy_spawn_delay = self.spawn_delay
+        self.score_threshold = 0
+        self.boss_spawned = False
+        self.game_over = False
+        self.set_quality(0)
+        if self.recorder is not None:
+            self.recorder.reset(self)
+
+    def apply_action(self, action):
+        if action in UPGRADE_ACTIONS:
+            getattr(self.player, action)()
+        elif action.startswith("switch:"):
+            self.player = switch_character(self.player, action[len("switch:"):])
+        elif action.startswith("quality:"):
+            self.set_quality(int(action[len("quality:"):]))
+        else:
+            raise ValueError(f"unknown action: {action!r}")
+        if self.recorder is not None:
+            self.recorder.action(action)
+
+    def set_quality(self, level):
+        settings = QUALITY_LEVELS[level]
+        self.quality = level
+        self.detail = settings["detail"]
+        self.projectile_detail = settings["projectile_detail"]
+        self.spawn_throttle = settings["spawn_throttle"]
+        self.ai_slices = settings["ai_slices"]
+
+    def step(self, frame):
+        if self.keep_previous:
+            self.save_previous()
+        timings = self.timings
+        if timings is None:
+            self.update_player(frame)
+            self.update_projectiles()
+            self.spawn_enemies()
+            self.update_enemies()
+            self.handle_collisions()
+            self.end_tick()
+        else:
+            t0 = perf_counter_ns()
+            self.update_player(frame)
+            t1 = perf_counter_ns()
+            self.update_projectiles()
+            t2 = perf_counter_ns()
+            self.spawn_enemies()
+            t3 = perf_counter_ns()
+            self.update_enemies()
+            t4 = perf_counter_ns()
+            self.handle_collisions()
+            t5 = perf_counter_ns()
+            self.end_tick()
+            t6 = perf_counter_ns()
+            timings["input"] = timings.get("input", 0) + t1 - t0
+            timings["movement"] = timings.get("movement", 0) + t2 - t1
+            timings["spawn"] = timings.get("spawn", 0) + t3 - t2
+            timings["enemy_update"] = timings.get("enemy_update", 0) + t4 - t3
+            timings["collisions"] = timings.get("collisions", 0) + t5 - t4
+            timings["cleanup"] = timings.get("cleanup", 0) + t6 - t5
+        if self.recorder is not None:
+            self.recorder.record(frame, self.state_hash())
+
+    def save_previous(self):
+        previous = self.previous
+        previous.clear()
+        player = self.player
+        previous[player] = (player.x, player.y)
+        for entity in chain(self.enemies, self.lasers, self.bullets):
+            previous[entity] = (entity.x, entity.y)
+
+    def blend(self, alpha):
+        if alpha >= 1 or self.blended is not None:
+            return
+        current = []
+        for entity, (x, y) in self.previous.items():
+            current.append((entity, entity.x, entity.y))
+            entity.x = x + (entity.x - x) * alpha
+            entity.y = y + (entity.y - y) * alpha
+        self.blended = (current, self.bullet_store.shift(1 - alpha), self.enemy_bullets.shift(1 - alpha))
+
+    def unblend(self):
+        if self.blended is None:
+            return
+        current, bullet_positions, enemy_bullet_positions = self.blended
+        for entity, x, y in current:
+            entity.x = x
+            entity.y = y
+        self.bullet_store.restore(bullet_positions)
+        self.enemy_bullets.restore(enemy_bullet_positions)
+        self.blended = None
+
+    def update_player(self, frame):
+        player = self.player
+        player.move(frame.keys, WIDTH, HEIGHT)
+        player.aim(frame.mouse_pos)
+        player.update_cooldown()
+        
+        if frame.mouse_held:
+            if hasattr(player, 'fire'):
+                new_bullets = player.fire(frame.mouse_pos, self.enemies, self.enemy_grid if USE_SPATIAL_HASH else None)
+                camera = self.camera
+                view = None
+                if camera.scrolls:
+                    camera.follow(player.x, player.y)
+                    view = camera.view()
+                for bullet in new_bullets:
+                    self.add_bullet(bullet, view)
+            elif player.can_shoot():
+                bullet = acquire(Bullet, player.x, player.y, player.angle, player.bullet_damage, player.bullet_speed)
+                self.bullet_store.add_projectile(bullet)
+                release(bullet)
+
+    def add_bullet(self, bullet, view=None):
+        if type(bullet) is Bullet:
+            self.bullet_store.add_projectile(bullet)
+            release(bullet)
+        elif type(bullet) is LaserBeam:
+            if view is not None:
+                bullet.end_x, bullet.end_y = bullet.calculate_screen_edge_intersection(bullet.x, bullet.y,
+                                                                                       bullet.angle, view)
+            self.lasers.append(bullet)
+        else:
+            self.bullets.append(bullet)
+            if USE_BATCH_MISSILES:
+                self.missiles.add(bullet)
+
+    def update_projectiles(self):
+        lasers = self.lasers
+        for laser in lasers:
+            if not laser.update():
+                lasers.kill(laser)
+        
+        bullets = self.bullets
+        for bullet in bullets:
+            target = bullet.target
+            if not target.alive or target.spawn_id != bullet.target_id:
+                enemy = self.nearest_enemy(bullet.x, bullet.y, RETARGET_RANGE)
+                if enemy is not None:
+                    bullet.retarget(enemy)
+            if not USE_BATCH_MISSILES:
+                if not bullet.update() or bullet.is_off_screen():
+                    bullets.kill(bullet)
+        if USE_BATCH_MISSILES:
+            for missile in self.missiles.step():
+                bullets.kill(missile)
+        self.bullet_store.update()
+        
+        self.enemy_bullets.update()
+
+    def nearest_enemy(self, x, y, max_distance=math.inf):
+        if USE_SPATIAL_HASH:
+            return self.enemy_grid.nearest(x, y, max_distance)
+        return nearest(self.enemies, x, y, max_distance)
+
+    def spawn_enemies(self):
+        self.enemy_spawn_timer += 1
+        if self.enemy_spawn_timer >= self.enemy_spawn_delay * self.spawn_throttle:
+            player = self.player
+            area = self.camera.area_around(player.x, player.y)
+            if player.score >= self.score_threshold + 200 and not self.boss_spawned:
+                enemy = spawn_enemy('boss', self.spawn_rng, self.ai_rng, area=area)
+                self.boss_spawned = True
+                self.score_threshold = player.score
+            else:
+                enemy = spawn_enemy(None, self.spawn_rng, self.ai_rng, self.spawn_weights, area)
+            self.add_enemy(enemy)
+            self.enemy_spawn_timer = 0
+            if self.enemy_spawn_delay > self.min_spawn_delay:
+                self.enemy_spawn_delay -= self.spawn_delay_decay
+
+    def add_enemy(self, enemy):
+        enemy.ai_slot = self.spawned
+        self.spawned += 1
+        self.enemies.append(enemy)
+        if USE_BATCH_STEERING:
+            self.world.add(enemy)
+
+    def update_enemies(self):
+        player = self.player
+        slices = self.ai_slices
+        if USE_BATCH_STEERING:
+            self.world.step(player, self.emitter, self.tick, slices)
+        else:
+            emitter = self.emitter
+            tick = self.tick
+            boids = []
+            for enemy in self.enemies:
+                enemy.update(player, emitter, slices == 1 or (tick + enemy.ai_slot) % slices == 0)
+                if "flock" in enemy.components:
+                    boids.append(enemy)
+            flock(boids, player)
+        self.enemy_bullets.enforce_limit()
+        
+        if not USE_SPATIAL_HASH:
+            for enemy in self.enemies:
+                player_rect = player.get_rect()
+                enemy_rect = enemy.get_rect()
+                
+                if player_rect.colliderect(enemy_rect):
+                    player.health -= enemy.damage
+                    self.kill_enemy(enemy)
+                    if player.health <= 0:
+                        self.game_over = True
+
+    def kill_enemy(self, enemy):
+        if self.enemies.kill(enemy):
+            self.enemy_grid.discard(enemy)
+            self.world.discard(enemy)
+
+    def score_kill(self, enemy):
+        player = self.player
+        player.score += enemy.score_value
+        player.add_experience(enemy.score_value)
+        if enemy.behavior == "boss":
+            self.boss_spawned = False
+
+    def damage_enemy(self, enemy, damage):
+        enemy.health -= damage
+        if enemy.health <= 0:
+            self.kill_enemy(enemy)
+            self.score_kill(enemy)
+
+    def first_hit(self, bullet):
+        bullet_rect = bullet.get_rect()
+        if USE_SPATIAL_HASH:
+            candidates = self.enemy_grid.query(bullet.x, bullet.y, bullet.radius)
+        else:
+            candidates = self.enemies
+        for enemy in candidates:
+            if bullet_rect.colliderect(enemy.get_rect()):
+                return enemy
+        return None
+
+    def laser_hits(self, laser):
+        candidates = self.enemy_grid.query_segment(laser.x, laser.y, laser.end_x, laser.end_y)
+        if len(candidates) < LASER_BATCH_MIN:
+            return candidates
+        count = len(candidates)
+        xs = np.fromiter((enemy.x for enemy in candidates), np.float64, count)
+        ys = np.fromiter((enemy.y for enemy in candidates), np.float64, count)
+        radii = np.fromiter((enemy.radius for enemy in candidates), np.float64, count)
+        return [candidates[i] for i in np.flatnonzero(laser.hit_mask(xs, ys, radii)).tolist()]
+
+    def handle_collisions(self):
+        player = self.player
+        enemies = self.enemies
+        bullets = self.bullets
+        enemy_grid = self.enemy_grid
+        
+        if USE_SPATIAL_HASH:
+            enemy_grid.rebuild(enemies)
+            player_rect = player.get_rect()
+            for enemy in enemy_grid.query(player.x, player.y, player.radius):
+                if player_rect.colliderect(enemy.get_rect()):
+                    player.health -= enemy.damage
+                    self.kill_enemy(enemy)
+                    if player.health <= 0:
+                        self.game_over = True
+        
+        for laser in self.lasers:
+            laser.hit_enemies.clear()
+            if USE_SPATIAL_HASH:
+                hits = self.laser_hits(laser)
+            else:
+                hits = enemies
+            for enemy in hits:
+                if enemy not in laser.hit_enemies and laser.check_circle_collision(enemy.x, enemy.y, enemy.radius):
+                    laser.hit_enemies.add(enemy)
+                    self.damage_enemy(enemy, laser.damage)
+        
+        for bullet in bullets:
+            enemy = self.first_hit(bullet)
+            if enemy is not None:
+                bullets.kill(bullet)
+                self.damage_enemy(enemy, bullet.damage)
+        
+        if USE_SPATIAL_HASH:
+            straight_bullets = self.bullet_store.query_grid(enemy_grid)
+        else:
+            straight_bullets = iter(self.bullet_store)
+        for bullet in straight_bullets:
+            enemy = self.first_hit(bullet)
+            if enemy is not None:
+                bullet.kill()
+                self.damage_enemy(enemy, bullet.damage)
+        
+        if USE_SPATIAL_HASH:
+            incoming = self.enemy_bullets.query(player.x, player.y, player.radius)
+        else:
+            incoming = iter(self.enemy_bullets)
+        for enemy_bullet in incoming:
+            bullet_rect = enemy_bullet.get_rect()
+            player_rect = player.get_rect()
+            if bullet_rect.colliderect(player_rect):
+                player.health -= enemy_bullet.damage
+                enemy_bullet.kill()
+                if player.health <= 0:
+                    self.game_over = True
+
+    def end_tick(self):
+        release_all(self.lasers.compact())
+        removed = self.bullets.compact()
+        if USE_BATCH_MISSILES:
+            for bullet in removed:
+                self.missiles.discard(bullet)
+        release_all(removed)
+        release_all(self.enemies.compact())
+        self.tick += 1
+
+    def state_hash(self):
+        player = self.player
+        crc = zlib.crc32(struct.pack("<q4d", self.tick, player.x, player.y, player.health, player.score))
+        
+        values = array("d")
+        for enemy in self.enemies:
+            values.extend((enemy.x, enemy.y, enemy.health))
+        for bullet in chain(self.lasers, self.bullets):
+            values.extend((bullet.x, bullet.y))
+        crc = zlib.crc32(values.tobytes(), crc)
+        
+        crc = self.bullet_store.checksum(crc)
+        return self.enemy_bullets.checksum(crc)
+
+    def render(self, surface):
+        camera = self.camera
+        camera.follow(self.player.x, self.player.y)
+        if not camera.scrolls:
+            self.drawn = len(self.enemies)
+            self.draw_entities(surface, self.lasers, self.bullets, self.enemies, None)
+            return
+        
+        camera.draw_grid(surface)
+        lasers = list(self.lasers)
+        bullets = [bullet for bullet in self.bullets if camera.sees(bullet.x, bullet.y, bullet.radius)]
+        enemies = self.visible_enemies()
+        self.drawn = len(enemies)
+        moved = camera.shift(chain((self.player,), lasers, bullets, enemies))
+        segments = camera.shift_segments(lasers)
+        self.draw_entities(surface, lasers, bullets, enemies, camera)
+        camera.restore_segments(segments)
+        camera.restore(moved)
+
+    def visible_enemies(self):
+        camera = self.camera
+        if USE_SPATIAL_HASH:
+            return self.enemy_grid.query_rect(*camera.view(VIEW_MARGIN))
+        return [enemy for enemy in self.enemies if camera.sees(enemy.x, enemy.y, enemy.radius + VIEW_MARGIN)]
+
+    def draw_entities(self, surface, lasers, bullets, enemies, camera):
+        if USE_SPRITES:
+            self.render_sprites(surface, lasers, bullets, enemies, camera)
+            return
+        self.player.draw(surface)
+        
+        for laser in lasers:
+            laser.draw(surface, self.projectile_detail)
+        for bullet in bullets:
+            bullet.draw(surface, self.projectile_detail)
+        self.bullet_store.draw(surface, camera)
+        
+        self.enemy_bullets.draw(surface, camera)
+        
+        detail = self.detail
+        for enemy in enemies:
+            enemy.draw(surface, detail)
+
+    def dirty_rects(self):
+        player = self.player
+        reach = player.radius + 20
+        rects = [(int(player.x) - reach, int(player.y) - reach, reach * 2 + 1, reach * 2 + 1)]
+        
+        for laser in self.lasers:
+            rects.append(laser.get_rect().inflate(laser.width * 2, laser.width * 2))
+        for bullet in self.bullets:
+            reach = bullet.radius + 1
+            rects.append((int(bullet.x) - reach, int(bullet.y) - reach, reach * 2 + 1, reach * 2 + 1))
+        rects.extend(self.bullet_store.dirty_rects())
+        rects.extend(self.enemy_bullets.dirty_rects())
+        
+        for enemy in self.enemies:
+            reach = enemy.radius + 1
+            rects.append((int(enemy.x) - reach, int(enemy.y) - reach, reach * 2 + 1, reach * 2 + 1))
+            if enemy.health_bar is not None:
+                bar_width, bar_height, offset, _ = enemy.health_bar
+                bar_x = int(enemy.x - bar_width // 2)
+                bar_y = int(enemy.y - enemy.radius - offset)
+                rects.append((bar_x - 1, bar_y - 1, bar_width + 2, bar_height + 2))
+        return rects
+
+    def render_sprites(self, surface, lasers, bullets, enemies, camera):
+        sprites = self.sprites
+        self.player.draw(surface)
+        
+        for laser in lasers:
+            laser.draw(surface, self.projectile_detail)
+        batch = []
+        ring = (2, 1) if self.projectile_detail else None
+        for bullet in bullets:
+            sprite, offset = sprites.circle(bullet.color, bullet.radius, ring, WHITE)
+            batch.append((sprite, (int(bullet.x) - offset, int(bullet.y) - offset)))
+        surface.blits(batch, False)
+        self.bullet_store.draw_sprites(surface, sprites, camera)
+        
+        self.enemy_bullets.draw_sprites(surface, sprites, camera)
+        
+        surface.blits(sprites.enemy_sprites(enemies, self.health_bars, self.detail), False)
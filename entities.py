@@ -0,0 +1,38 @@
+class EntityList:
+    def __init__(self, items=()):
+        self.items = list(items)
+        self.dead = 0
+
+    def __iter__(self):
+        for entity in self.items:
+            if entity.alive:
+                yield entity
+
+    def __len__(self):
+        return len(self.items) - self.dead
+
+    def append(self, entity):
+        self.items.append(entity)
+
+    def extend(self, entities):
+        self.items.extend(entities)
+
+    def kill(self, entity):
+        if not entity.alive:
+            return False
+        entity.alive = False
+        self.dead += 1
+        return True
+
+    def compact(self):
+        if not self.dead:
+            return []
+        items = self.items
+        removed = [entity for entity in items if not entity.alive]
+        self.items = [entity for entity in items if entity.alive]
+        self.dead = 0
+        return removed
+
+    def clear(self):
+        self.items = []
+        self.dead = 0
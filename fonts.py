@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+import pygame
+
+FONT_NAMES = ["SimHei", "Microsoft YaHei", "SimSun", "Arial"]
+CACHE_VERSION = 1
+
+def cache_path():
+    path = os.environ.get("SHOOTER_FONT_CACHE")
+    if path:
+        return path
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "shooter_game", "font.json")
+
+def font_dirs():
+    if sys.platform == "win32":
+        return [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")]
+    if sys.platform == "darwin":
+        return ["/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+    return ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"),
+            os.path.expanduser("~/.local/share/fonts")]
+
+def stamp(path):
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return [info.st_mtime_ns, info.st_size]
+
+def load_cache(path, names):
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION or entry.get("names") != names:
+        return None
+    
+    font = entry.get("path")
+    if font is not None:
+        if stamp(font) != entry.get("stamp"):
+            return None
+    elif entry.get("dirs") != [stamp(d) for d in font_dirs()]:
+        return None
+    return entry
+
+def save_cache(path, names, font):
+    entry = {"version": CACHE_VERSION, "names": names, "path": font}
+    if font is not None:
+        entry["stamp"] = stamp(font)
+    else:
+        entry["dirs"] = [stamp(d) for d in font_dirs()]
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+def find_font(names=FONT_NAMES):
+    names = list(names)
+    path = cache_path()
+    entry = load_cache(path, names)
+    if entry is not None:
+        return entry["path"], True
+    
+    font = None
+    for name in names:
+        font = pygame.font.match_font(name)
+        if font:
+            break
+    save_cache(path, names, font or None)
+    return font or None, False
+
+def load_fonts(sizes, names=FONT_NAMES):
+    if not pygame.font.get_init():
+        pygame.font.init()
+    path, cached = find_font(names)
+    fonts = []
+    for size in sizes:
+        try:
+            fonts.append(pygame.font.Font(path, size))
+        except (OSError, pygame.error):
+            fonts.append(pygame.font.Font(None, size))
+    return fonts, path, cached
@@ -0,0 +1,47 @@
+import os
+from engine import QUALITY_LEVELS
+
+FRAME_BUDGET_MS = float(os.environ.get("SHOOTER_FRAME_BUDGET", 1000 / 60))
+MAX_QUALITY = int(os.environ.get("SHOOTER_MAX_QUALITY", len(QUALITY_LEVELS) - 1))
+
+class QualityGovernor:
+    def __init__(self, engine, budget_ms=FRAME_BUDGET_MS, max_level=MAX_QUALITY, smoothing=0.1,
+                 down_frames=10, up_frames=120, headroom=0.7):
+        self.engine = engine
+        self.budget_ms = budget_ms
+        self.max_level = min(max_level, len(QUALITY_LEVELS) - 1)
+        self.smoothing = smoothing
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.headroom = headroom
+        self.level = 0
+        self.average_ms = 0.0
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+
+    def frame(self, cost_ms):
+        self.average_ms += (cost_ms - self.average_ms) * self.smoothing
+        if self.average_ms > self.budget_ms:
+            self.over += 1
+            self.under = 0
+        elif self.average_ms < self.budget_ms * self.headroom:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = 0
+            self.under = 0
+        
+        if self.over >= self.down_frames and self.level < self.max_level:
+            self.level += 1
+            self.over = 0
+            self.changes += 1
+        elif self.under >= self.up_frames and self.level > 0:
+            self.level -= 1
+            self.under = 0
+            self.changes += 1
+        self.apply()
+
+    def apply(self):
+        if self.engine.quality != self.level:
+            self.engine.apply_action(f"quality:{self.level}")
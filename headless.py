@@ -0,0 +1,103 @@
+import argparse
+import math
+import time
+import pygame
+from engine import FrameInput, GameEngine, KeySet
+from player import PLAYER_TYPES, create_player
+from camera import SCREEN_WIDTH, SCREEN_HEIGHT
+from projectile import WIDTH, HEIGHT
+from replay import InputRecorder
+
+MOVE_KEYS = (pygame.K_w, pygame.K_d, pygame.K_s, pygame.K_a)
+
+def idle_script(tick):
+    return FrameInput(KeySet(), (WIDTH // 2, 0), False)
+
+def turret_script(tick):
+    angle = tick / 20
+    mouse_pos = (WIDTH / 2 + math.cos(angle) * 300, HEIGHT / 2 + math.sin(angle) * 250)
+    return FrameInput(KeySet(), mouse_pos, True)
+
+def strafe_script(tick):
+    keys = KeySet((MOVE_KEYS[tick // 40 % 4],))
+    return FrameInput(keys, turret_script(tick).mouse_pos, True)
+
+SCRIPTS = {
+    "idle": idle_script,
+    "turret": turret_script,
+    "strafe": strafe_script,
+}
+
+class BotScript:
+    def __init__(self, engine, flee_distance=150):
+        self.engine = engine
+        self.flee_distance = flee_distance
+
+    def __call__(self, tick):
+        engine = self.engine
+        player = engine.player
+        enemy = engine.nearest_enemy(player.x, player.y)
+        if enemy is None:
+            return FrameInput(KeySet(), turret_script(tick).mouse_pos, False)
+        
+        dx = enemy.x - player.x
+        dy = enemy.y - player.y
+        if dx * dx + dy * dy < self.flee_distance * self.flee_distance:
+            dx, dy = -dx, -dy
+        else:
+            dx = WIDTH / 2 - player.x
+            dy = HEIGHT / 2 - player.y
+        keys = []
+        if abs(dx) > 10:
+            keys.append(pygame.K_d if dx > 0 else pygame.K_a)
+        if abs(dy) > 10:
+            keys.append(pygame.K_s if dy > 0 else pygame.K_w)
+        return FrameInput(KeySet(keys), (enemy.x, enemy.y), True)
+
+def make_script(name, engine):
+    if name == "bot":
+        return BotScript(engine)
+    return SCRIPTS[name]
+
+def run(ticks, script=strafe_script, character="normal", seed=None, render=False, stop_on_game_over=True,
+        recorder=None):
+    engine = GameEngine(create_player(character, WIDTH // 2, HEIGHT // 2), seed=seed, recorder=recorder)
+    if isinstance(script, str):
+        script = make_script(script, engine)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) if render else None
+    
+    for tick in range(ticks):
+        if engine.game_over and stop_on_game_over:
+            break
+        engine.step(script(tick))
+        if surface is not None:
+            surface.fill((0, 0, 0))
+            engine.render(surface)
+    return engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game simulation without a window.")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--script", choices=sorted(SCRIPTS) + ["bot"], default="strafe")
+    parser.add_argument("--character", choices=sorted(PLAYER_TYPES), default="normal")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--render", action="store_true", help="draw every tick into an off-screen surface")
+    parser.add_argument("--keep-going", action="store_true", help="keep stepping after game over")
+    parser.add_argument("--record", metavar="PATH", help="write an input log that replay.py can verify")
+    args = parser.parse_args()
+    
+    recorder = InputRecorder(args.record) if args.record else None
+    start = time.perf_counter()
+    engine = run(args.ticks, args.script, args.character, args.seed,
+                 args.render, not args.keep_going, recorder)
+    elapsed = time.perf_counter() - start
+    if recorder is not None:
+        recorder.close()
+    
+    player = engine.player
+    print(f"ticks: {engine.tick}  elapsed: {elapsed:.2f}s  ticks/s: {engine.tick / elapsed:.0f}")
+    print(f"score: {player.score}  health: {player.health}  level: {player.level}  "
+          f"enemies: {len(engine.enemies)}  game over: {engine.game_over}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import math
+import numpy as np
+from ecs import Table
+from projectile import WIDTH, HEIGHT
+
+BATCH_MIN = 80
+
+class HomingMissiles(Table):
+    columns = ("x", "y", "angle", "speed", "turn_rate", "lifetime", "target_x", "target_y")
+    attributes = ("x", "y", "angle", "speed", "turn_rate", "lifetime")
+    stale = False
+
+    def step(self):
+        self.compact()
+        n = self.count
+        if not n:
+            return []
+        
+        missiles = self.entities
+        if n < BATCH_MIN:
+            self.stale = True
+            return [missile for missile in missiles if not missile.update() or missile.is_off_screen()]
+        if self.stale:
+            for name in ("x", "y", "angle", "lifetime"):
+                getattr(self, name)[:n] = [getattr(missile, name) for missile in missiles]
+            self.stale = False
+        
+        target_x = self.target_x[:n]
+        target_y = self.target_y[:n]
+        for i, missile in enumerate(missiles):
+            target = missile.target
+            if target.spawn_id == missile.target_id:
+                missile.target_x = target.x
+                missile.target_y = target.y
+            target_x[i] = missile.target_x
+            target_y[i] = missile.target_y
+        
+        x = self.x[:n]
+        y = self.y[:n]
+        angle = self.angle[:n]
+        heading = map(math.atan2, (target_y - y).tolist(), (target_x - x).tolist())
+        angle_diff = np.fromiter(heading, np.float64, n) - angle
+        angle_diff[angle_diff > math.pi] -= 2 * math.pi
+        angle_diff[angle_diff < -math.pi] += 2 * math.pi
+        turn_rate = self.turn_rate[:n]
+        angle += np.clip(angle_diff, -turn_rate, turn_rate)
+        angle[angle > math.pi] -= 2 * math.pi
+        angle[angle < -math.pi] += 2 * math.pi
+        
+        speed = self.speed[:n]
+        values = angle.tolist()
+        x += np.fromiter(map(math.cos, values), np.float64, n) * speed
+        y += np.fromiter(map(math.sin, values), np.float64, n) * speed
+        lifetime = self.lifetime[:n]
+        lifetime -= 1
+        
+        rows = zip(missiles, x.tolist(), y.tolist(), angle.tolist(), lifetime.astype(np.int64).tolist())
+        for missile, new_x, new_y, new_angle, new_lifetime in rows:
+            missile.x = new_x
+            missile.y = new_y
+            missile.angle = new_angle
+            missile.lifetime = new_lifetime
+        
+        expired = (lifetime <= 0) | (x < -50) | (x > WIDTH + 50) | (y < -50) | (y > HEIGHT + 50)
+        return [missiles[i] for i in np.flatnonzero(expired).tolist()]
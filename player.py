@@ -1,6 +1,8 @@
 import pygame
 import math
 import random
+from pool import acquire
+from spatial import nearest
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -110,6 +112,9 @@ class BasePlayer:
     def shoot(self):
         return []
 
+    def fire(self, target_pos, enemies, index=None):
+        return self.shoot()
+
 class NormalPlayer(BasePlayer):
     def __init__(self, x, y):
         super().__init__(x, y)
@@ -120,7 +125,7 @@ class NormalPlayer(BasePlayer):
     def shoot(self):
         if self.can_shoot():
             from projectile import Bullet
-            return [Bullet(self.x, self.y, self.angle, self.bullet_damage, self.bullet_speed)]
+            return [acquire(Bullet, self.x, self.y, self.angle, self.bullet_damage, self.bullet_speed)]
         return []
 
 class ShotgunPlayer(BasePlayer):
@@ -140,7 +145,7 @@ class ShotgunPlayer(BasePlayer):
             bullets = []
             for i in range(3):
                 angle = self.angle + (i - 1) * self.spread
-                bullets.append(Bullet(self.x, self.y, angle, self.bullet_damage, self.bullet_speed))
+                bullets.append(acquire(Bullet, self.x, self.y, angle, self.bullet_damage, self.bullet_speed))
             return bullets
         return []
 
@@ -169,9 +174,12 @@ class LaserPlayer(BasePlayer):
             from projectile import LaserBeam
             if mouse_pos is None:
                 mouse_pos = (self.x + math.cos(self.angle) * 100, self.y + math.sin(self.angle) * 100)
-            return [LaserBeam(self.x, self.y, mouse_pos[0], mouse_pos[1], self.bullet_damage)]
+            return [acquire(LaserBeam, self.x, self.y, mouse_pos[0], mouse_pos[1], self.bullet_damage)]
         return []
 
+    def fire(self, target_pos, enemies, index=None):
+        return self.shoot(target_pos)
+
     def draw(self, screen):
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
         pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius - 3, 2)
@@ -191,25 +199,24 @@ class MissilePlayer(BasePlayer):
         self.fire_rate = 20
         self.missile_speed = 6
 
-    def shoot(self, enemies):
+    def shoot(self, enemies, index=None):
         if self.can_shoot():
             from projectile import Missile
-            target = None
-            min_distance = 500
-            
-            for enemy in enemies:
-                distance = math.sqrt((enemy.x - self.x)**2 + (enemy.y - self.y)**2)
-                if distance < min_distance:
-                    min_distance = distance
-                    target = enemy
+            if index is None:
+                target = nearest(enemies, self.x, self.y, 500)
+            else:
+                target = index.nearest(self.x, self.y, 500)
             
             if target:
-                return [Missile(self.x, self.y, target, self.bullet_damage, self.missile_speed)]
+                return [acquire(Missile, self.x, self.y, target, self.bullet_damage, self.missile_speed)]
             else:
                 from projectile import Bullet
-                return [Bullet(self.x, self.y, self.angle, self.bullet_damage, self.missile_speed)]
+                return [acquire(Bullet, self.x, self.y, self.angle, self.bullet_damage, self.missile_speed)]
         return []
 
+    def fire(self, target_pos, enemies, index=None):
+        return self.shoot(enemies, index)
+
     def draw(self, screen):
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
         pygame.draw.circle(screen, BLACK, (int(self.x), int(self.y)), self.radius - 4, 3)
@@ -232,7 +239,7 @@ class RapidFirePlayer(BasePlayer):
     def shoot(self):
         if self.can_shoot():
             from projectile import Bullet
-            return [Bullet(self.x, self.y, self.angle, self.bullet_damage, self.bullet_speed)]
+            return [acquire(Bullet, self.x, self.y, self.angle, self.bullet_damage, self.bullet_speed)]
         return []
 
     def draw(self, screen):
@@ -255,3 +262,24 @@ def create_player(player_type, x, y):
     if player_type in PLAYER_TYPES:
         return PLAYER_TYPES[player_type](x, y)
     return NormalPlayer(x, y)
+
+def switch_character(player, char_type):
+    new_player = create_player(char_type, player.x, player.y)
+    new_player.health = player.health
+    new_player.max_health = player.max_health
+    new_player.score = player.score
+    new_player.experience = player.experience
+    new_player.level = player.level
+    new_player.experience_to_next_level = player.experience_to_next_level
+    new_player.upgrade_points = player.upgrade_points
+    new_player.speed = player.speed
+    new_player.bullet_speed = player.bullet_speed
+    new_player.bullet_damage = player.bullet_damage
+    new_player.fire_rate = player.fire_rate
+    return new_player
+
+def player_type_key(player):
+    for key, cls in PLAYER_TYPES.items():
+        if type(player) is cls:
+            return key
+    return "normal"
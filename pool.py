@@ -0,0 +1,99 @@
+import gc
+import sys
+import tracemalloc
+
+class Pool:
+    def __init__(self, cls, size=0):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.in_use = 0
+        self.high_water = 0
+        self.acquired = 0
+        self.prewarm(size)
+
+    def prewarm(self, size):
+        new = self.cls.__new__
+        while len(self.free) < size:
+            self.free.append(new(self.cls))
+            self.created += 1
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.cls.__new__(self.cls)
+            self.created += 1
+        obj.__init__(*args)
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "acquired": self.acquired,
+            "in_use": self.in_use,
+            "free": len(self.free),
+            "high_water": self.high_water,
+        }
+
+POOLS = {}
+
+def get_pool(cls):
+    pool = POOLS.get(cls)
+    if pool is None:
+        pool = POOLS[cls] = Pool(cls)
+    return pool
+
+def prewarm(cls, size):
+    get_pool(cls).prewarm(size)
+
+def acquire(cls, *args):
+    return get_pool(cls).acquire(*args)
+
+def release(obj):
+    get_pool(type(obj)).release(obj)
+
+def release_all(objs):
+    for obj in objs:
+        get_pool(type(obj)).release(obj)
+
+def pool_stats():
+    return {cls.__name__: pool.stats() for cls, pool in POOLS.items()}
+
+def measure_bytes(factory, count=2000):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    objs = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - base - sys.getsizeof(objs)
+    tracemalloc.stop()
+    return size / count
+
+if __name__ == "__main__":
+    from projectile import Bullet, LaserBeam, Missile
+    from enemy import *
+    
+    target = Enemy(300.0, 200.0)
+    factories = [
+        ("Bullet", lambda: Bullet(100.5, 200.5, 0.3)),
+        ("EnemyBullet", lambda: EnemyBullet(100.5, 200.5, 0.3)),
+        ("LaserBeam", lambda: LaserBeam(100.5, 200.5, 400.0, 300.0)),
+        ("Missile", lambda: Missile(100.5, 200.5, target)),
+        ("Enemy", lambda: Enemy(100, 200)),
+        ("FastEnemy", lambda: FastEnemy(100, 200)),
+        ("TankEnemy", lambda: TankEnemy(100, 200)),
+        ("ShooterEnemy", lambda: ShooterEnemy(100, 200)),
+        ("WanderingEnemy", lambda: WanderingEnemy(100, 200)),
+        ("SwarmEnemy", lambda: SwarmEnemy(100, 200)),
+        ("BossEnemy", lambda: BossEnemy(100, 200)),
+    ]
+    for name, factory in factories:
+        print(f"{name:<16}{measure_bytes(factory):8.0f} bytes")
@@ -0,0 +1,136 @@
+import csv
+import json
+import os
+from collections import deque
+from time import perf_counter_ns
+import pygame
+from engine import STAGES
+
+FRAME_STAGES = ("wait", "events") + STAGES + ("render", "ui", "overlay", "flip")
+
+ENEMY_KINDS = (
+    "Enemy",
+    "FastEnemy",
+    "TankEnemy",
+    "ShooterEnemy",
+    "WanderingEnemy",
+    "SwarmEnemy",
+    "BossEnemy",
+)
+
+COUNT_COLUMNS = ("bullets", "enemy_bullets", "enemies") + ENEMY_KINDS + ("quality", "drawn")
+
+class FrameProfiler:
+    def __init__(self, engine, path=None, window=60):
+        self.engine = engine
+        self.overlay = False
+        self.file = None
+        self.writer = None
+        self.jsonl = False
+        if path:
+            self.file = open(path, "w", encoding="utf-8", newline="")
+            self.jsonl = os.path.splitext(path)[1].lower() == ".jsonl"
+            if not self.jsonl:
+                self.writer = csv.writer(self.file)
+                self.writer.writerow(("frame", "frame_ms") + FRAME_STAGES + COUNT_COLUMNS)
+        self.history = deque(maxlen=window)
+        self.times = {}
+        self.frame = 0
+        self.start = 0
+        self.last = 0
+        self.font = None
+        self.enabled = False
+        self.set_enabled(self.file is not None)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.engine.timings = self.times if enabled else None
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.set_enabled(self.overlay or self.file is not None)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.times.clear()
+        self.start = self.last = perf_counter_ns()
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self.times[name] = now - self.last
+        self.last = now
+
+    def resume(self):
+        if self.enabled:
+            self.last = perf_counter_ns()
+
+    def counts(self):
+        engine = self.engine
+        counts = dict.fromkeys(COUNT_COLUMNS, 0)
+        counts["bullets"] = len(engine.lasers) + len(engine.bullets) + len(engine.bullet_store)
+        counts["enemy_bullets"] = len(engine.enemy_bullets)
+        counts["enemies"] = len(engine.enemies)
+        counts["quality"] = engine.quality
+        counts["drawn"] = engine.drawn
+        for enemy in engine.enemies:
+            name = type(enemy).__name__
+            if name in counts:
+                counts[name] += 1
+        return counts
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame_ns = perf_counter_ns() - self.start
+        times = self.times
+        stages = {name: times.get(name, 0) / 1e6 for name in FRAME_STAGES}
+        counts = self.counts()
+        self.history.append((frame_ns / 1e6, stages, counts))
+        
+        if self.writer is not None:
+            self.writer.writerow([self.frame, round(frame_ns / 1e6, 4)]
+                                 + [round(stages[name], 4) for name in FRAME_STAGES]
+                                 + [counts[name] for name in COUNT_COLUMNS])
+        elif self.file is not None:
+            entry = {"frame": self.frame, "frame_ms": round(frame_ns / 1e6, 4)}
+            entry.update((name, round(value, 4)) for name, value in stages.items())
+            entry.update(counts)
+            self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.frame += 1
+
+    def draw(self, screen):
+        if not self.overlay or not self.history:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        
+        history = self.history
+        frames = len(history)
+        frame_ms = [entry[0] for entry in history]
+        mean_ms = sum(frame_ms) / frames
+        lines = [f"frame {mean_ms:6.2f} ms avg  {max(frame_ms):6.2f} max  {1000 / mean_ms:5.0f} fps"]
+        for name in FRAME_STAGES:
+            stage_ms = sum(entry[1][name] for entry in history) / frames
+            lines.append(f"{name:<13}{stage_ms:7.3f} ms")
+        
+        counts = history[-1][2]
+        lines.append(f"bullets {counts['bullets']}  enemy bullets {counts['enemy_bullets']}")
+        lines.append(f"enemies {counts['enemies']}  drawn {counts['drawn']}  quality {counts['quality']}")
+        for name in ENEMY_KINDS:
+            if counts[name]:
+                lines.append(f"  {name:<15}{counts[name]:5d}")
+        
+        line_height = self.font.get_linesize()
+        panel = pygame.Surface((230, line_height * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            panel.blit(self.font.render(line, True, (220, 220, 220)), (6, 4 + i * line_height))
+        return screen.blit(panel, (screen.get_width() - panel.get_width() - 6, 6))
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
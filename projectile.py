@@ -1,9 +1,13 @@
 import pygame
 import math
+import numpy as np
+from camera import WORLD_WIDTH, WORLD_HEIGHT
 
-WIDTH, HEIGHT = 800, 600
+WIDTH, HEIGHT = WORLD_WIDTH, WORLD_HEIGHT
 
 class Bullet:
+    __slots__ = ("x", "y", "radius", "speed", "angle", "dx", "dy", "color", "damage")
+
     def __init__(self, x, y, angle, damage=10, speed=10):
         self.x = x
         self.y = y
@@ -30,7 +34,10 @@ class Bullet:
         return pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius * 2, self.radius * 2)
 
 class LaserBeam:
-    def __init__(self, x, y, mouse_x, mouse_y, damage=15):
+    __slots__ = ("x", "y", "damage", "width", "color", "lifetime", "hit_enemies",
+                 "angle", "end_x", "end_y", "alive")
+
+    def __init__(self, x, y, mouse_x, mouse_y, damage=15, view=None):
         self.x = x
         self.y = y
         self.damage = damage*0.1
@@ -38,43 +45,45 @@ class LaserBeam:
         self.color = (0, 255, 255)
         self.lifetime = 10
         self.hit_enemies = set()
+        self.alive = True
         
         dx = mouse_x - x
         dy = mouse_y - y
         self.angle = math.atan2(dy, dx)
         
-        self.end_x, self.end_y = self.calculate_screen_edge_intersection(x, y, self.angle)
+        self.end_x, self.end_y = self.calculate_screen_edge_intersection(x, y, self.angle, view)
 
-    def calculate_screen_edge_intersection(self, x, y, angle):
+    def calculate_screen_edge_intersection(self, x, y, angle, view=None):
+        left, top, right, bottom = view or (0, 0, WIDTH, HEIGHT)
         cos_a = math.cos(angle)
         sin_a = math.sin(angle)
         
         if abs(cos_a) < 0.0001:
             if sin_a > 0:
-                return x, HEIGHT
+                return x, bottom
             else:
-                return x, 0
+                return x, top
         
         if abs(sin_a) < 0.0001:
             if cos_a > 0:
-                return WIDTH, y
+                return right, y
             else:
-                return 0, y
+                return left, y
         
         t_candidates = []
         
         if cos_a > 0:
-            t_right = (WIDTH - x) / cos_a
+            t_right = (right - x) / cos_a
             t_candidates.append(t_right)
         elif cos_a < 0:
-            t_left = -x / cos_a
+            t_left = (left - x) / cos_a
             t_candidates.append(t_left)
         
         if sin_a > 0:
-            t_bottom = (HEIGHT - y) / sin_a
+            t_bottom = (bottom - y) / sin_a
             t_candidates.append(t_bottom)
         elif sin_a < 0:
-            t_top = -y / sin_a
+            t_top = (top - y) / sin_a
             t_candidates.append(t_top)
         
         t = min(t for t in t_candidates if t > 0)
@@ -85,9 +94,10 @@ class LaserBeam:
         self.lifetime -= 1
         return self.lifetime > 0
 
-    def draw(self, screen):
+    def draw(self, screen, detail=True):
         pygame.draw.line(screen, self.color, (self.x, self.y), (self.end_x, self.end_y), self.width)
-        pygame.draw.line(screen, (255, 255, 255), (self.x, self.y), (self.end_x, self.end_y), 2)
+        if detail:
+            pygame.draw.line(screen, (255, 255, 255), (self.x, self.y), (self.end_x, self.end_y), 2)
 
     def get_rect(self):
         min_x = min(self.x, self.end_x)
@@ -115,11 +125,35 @@ class LaserBeam:
         
         return distance_sq <= radius * radius
 
+    def hit_mask(self, xs, ys, radii):
+        dx = self.end_x - self.x
+        dy = self.end_y - self.y
+        line_length_sq = dx * dx + dy * dy
+        if line_length_sq == 0:
+            return np.zeros(len(xs), dtype=bool)
+        
+        fx = xs - self.x
+        fy = ys - self.y
+        t = np.clip((fx * dx + fy * dy) / line_length_sq, 0, 1)
+        
+        closest_x = self.x + t * dx
+        closest_y = self.y + t * dy
+        
+        distance_sq = np.float_power(xs - closest_x, 2) + np.float_power(ys - closest_y, 2)
+        
+        return distance_sq <= radii * radii
+
 class Missile:
+    __slots__ = ("x", "y", "target", "target_id", "target_x", "target_y", "damage", "speed",
+                 "radius", "color", "turn_rate", "angle", "dx", "dy", "lifetime", "alive")
+
     def __init__(self, x, y, target, damage=20, speed=6):
         self.x = x
         self.y = y
         self.target = target
+        self.target_id = target.spawn_id
+        self.target_x = target.x
+        self.target_y = target.y
         self.damage = damage
         self.speed = speed
         self.radius = 6
@@ -129,11 +163,21 @@ class Missile:
         self.dx = math.cos(self.angle) * speed
         self.dy = math.sin(self.angle) * speed
         self.lifetime = 300
+        self.alive = True
+
+    def retarget(self, target):
+        self.target = target
+        self.target_id = target.spawn_id
+        self.target_x = target.x
+        self.target_y = target.y
 
     def update(self):
         if self.target:
-            dx = self.target.x - self.x
-            dy = self.target.y - self.y
+            if self.target.spawn_id == self.target_id:
+                self.target_x = self.target.x
+                self.target_y = self.target.y
+            dx = self.target_x - self.x
+            dy = self.target_y - self.y
             target_angle = math.atan2(dy, dx)
             
             angle_diff = target_angle - self.angle
@@ -143,6 +187,10 @@ class Missile:
                 angle_diff += 2 * math.pi
             
             self.angle += max(-self.turn_rate, min(self.turn_rate, angle_diff))
+            if self.angle > math.pi:
+                self.angle -= 2 * math.pi
+            elif self.angle < -math.pi:
+                self.angle += 2 * math.pi
         
         self.dx = math.cos(self.angle) * self.speed
         self.dy = math.sin(self.angle) * self.speed
@@ -152,9 +200,10 @@ class Missile:
         
         return self.lifetime > 0
 
-    def draw(self, screen):
+    def draw(self, screen, detail=True):
         pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.radius - 2, 1)
+        if detail:
+            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.radius - 2, 1)
 
     def is_off_screen(self):
         return (self.x < -50 or self.x > WIDTH + 50 or 
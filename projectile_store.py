@@ -0,0 +1,266 @@
+import pygame
+import zlib
+import numpy as np
+
+FIELDS = ("x", "y", "dx", "dy", "damage", "radius")
+
+def _number(value):
+    value = value.item()
+    if value.is_integer():
+        return int(value)
+    return value
+
+class ProjectileView:
+    __slots__ = ("store", "index")
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def x(self):
+        return self.store.x[self.index].item()
+
+    @property
+    def y(self):
+        return self.store.y[self.index].item()
+
+    @property
+    def dx(self):
+        return self.store.dx[self.index].item()
+
+    @property
+    def dy(self):
+        return self.store.dy[self.index].item()
+
+    @property
+    def damage(self):
+        return _number(self.store.damage[self.index])
+
+    @property
+    def radius(self):
+        return _number(self.store.radius[self.index])
+
+    @property
+    def color(self):
+        return self.store.palette[self.store.color[self.index]]
+
+    @property
+    def owner(self):
+        return self.store.owner[self.index].item()
+
+    @property
+    def alive(self):
+        return bool(self.store.alive[self.index])
+
+    def kill(self):
+        self.store.kill(self.index)
+
+    def draw(self, screen):
+        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+
+    def is_off_screen(self):
+        min_x, min_y, max_x, max_y = self.store.bounds
+        x, y = self.x, self.y
+        return x < min_x or x > max_x or y < min_y or y > max_y
+
+    def get_rect(self):
+        radius = self.radius
+        return pygame.Rect(self.x - radius, self.y - radius, radius * 2, radius * 2)
+
+class ProjectileStore:
+    def __init__(self, width, height, capacity=256, limit=None):
+        self.bounds = (0, 0, width, height)
+        self.limit = limit
+        self.evicted = 0
+        self.count = 0
+        self.palette = []
+        self.palette_index = {}
+        for name in FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float32))
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.owner = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def __iter__(self):
+        return self.views(np.flatnonzero(self.alive[:self.count]))
+
+    def views(self, indices):
+        for index in indices.tolist():
+            yield ProjectileView(self, index)
+
+    def _grow(self, needed):
+        capacity = max(needed, len(self.x) * 2)
+        for name in FIELDS + ("color", "owner", "alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _color_index(self, color):
+        index = self.palette_index.get(color)
+        if index is None:
+            index = self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+        return index
+
+    def add(self, x, y, dx, dy, damage, radius, color, owner=-1):
+        i = self.count
+        if i >= len(self.x):
+            self._grow(i + 1)
+        self.x[i] = x
+        self.y[i] = y
+        self.dx[i] = dx
+        self.dy[i] = dy
+        self.damage[i] = damage
+        self.radius[i] = radius
+        self.color[i] = self._color_index(color)
+        self.owner[i] = owner
+        self.alive[i] = True
+        self.count = i + 1
+        return i
+
+    def add_projectile(self, projectile):
+        return self.add(projectile.x, projectile.y, projectile.dx, projectile.dy,
+                        projectile.damage, projectile.radius, projectile.color)
+
+    def extend(self, projectiles):
+        for projectile in projectiles:
+            self.add_projectile(projectile)
+
+    def kill(self, index):
+        self.alive[index] = False
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.dx[:n]
+        y += self.dy[:n]
+        
+        min_x, min_y, max_x, max_y = self.bounds
+        off = (x < min_x) | (x > max_x) | (y < min_y) | (y > max_y)
+        np.logical_and(self.alive[:n], ~off, out=self.alive[:n])
+        self.compact()
+
+    def compact(self):
+        n = self.count
+        keep = np.flatnonzero(self.alive[:n])
+        k = len(keep)
+        if k == n:
+            return
+        for name in FIELDS + ("color", "owner"):
+            values = getattr(self, name)
+            values[:k] = values[keep]
+        self.alive[:k] = True
+        self.alive[k:n] = False
+        self.count = k
+
+    def enforce_limit(self):
+        limit = self.limit
+        n = self.count
+        if limit is None or n <= limit:
+            return 0
+        alive = self.alive[:n]
+        live = np.flatnonzero(alive)
+        excess = len(live) - limit
+        if excess <= 0:
+            return 0
+        alive[live[:excess]] = False
+        self.evicted += excess
+        self.compact()
+        return excess
+
+    def query(self, x, y, radius):
+        n = self.count
+        reach = radius + self.max_radius() + 2
+        indices = np.flatnonzero(self.alive[:n] &
+                                 (np.abs(self.x[:n] - x) <= reach) &
+                                 (np.abs(self.y[:n] - y) <= reach))
+        return self.views(indices)
+
+    def query_grid(self, grid):
+        n = self.count
+        mask = grid.near_mask(self.x[:n], self.y[:n], self.max_radius())
+        return self.views(np.flatnonzero(mask & self.alive[:n]))
+
+    def checksum(self, crc=0):
+        n = self.count
+        crc = zlib.crc32(self.x[:n].tobytes(), crc)
+        crc = zlib.crc32(self.y[:n].tobytes(), crc)
+        return zlib.crc32(self.alive[:n].tobytes(), crc)
+
+    def max_radius(self):
+        if not self.count:
+            return 0
+        return float(self.radius[:self.count].max())
+
+    def visible(self, camera):
+        n = self.count
+        alive = self.alive[:n]
+        if camera is None:
+            return alive, 0, 0
+        left, top, right, bottom = camera.view(self.max_radius() + 1)
+        x = self.x[:n]
+        y = self.y[:n]
+        return alive & (x >= left) & (x <= right) & (y >= top) & (y <= bottom), camera.x, camera.y
+
+    def draw(self, screen, camera=None):
+        n = self.count
+        if not n:
+            return
+        palette = self.palette
+        draw_circle = pygame.draw.circle
+        alive, ox, oy = self.visible(camera)
+        rows = zip((self.x[:n][alive].astype(np.int32) - ox).tolist(),
+                   (self.y[:n][alive].astype(np.int32) - oy).tolist(),
+                   self.radius[:n][alive].astype(np.int32).tolist(),
+                   self.color[:n][alive].tolist())
+        for x, y, radius, color in rows:
+            draw_circle(screen, palette[color], (x, y), radius)
+
+    def shift(self, lag):
+        n = self.count
+        saved = (self.x[:n].copy(), self.y[:n].copy())
+        self.x[:n] -= self.dx[:n] * lag
+        self.y[:n] -= self.dy[:n] * lag
+        return saved
+
+    def restore(self, saved):
+        x, y = saved
+        n = len(x)
+        self.x[:n] = x
+        self.y[:n] = y
+
+    def dirty_rects(self):
+        n = self.count
+        alive = self.alive[:n]
+        reach = self.radius[:n][alive].astype(np.int32) + 1
+        size = reach * 2 + 1
+        return np.stack((self.x[:n][alive].astype(np.int32) - reach,
+                         self.y[:n][alive].astype(np.int32) - reach, size, size), axis=1).tolist()
+
+    def draw_sprites(self, screen, atlas, camera=None):
+        n = self.count
+        if not n:
+            return
+        alive, ox, oy = self.visible(camera)
+        radius = self.radius[:n][alive].astype(np.int32)
+        looks, inverse = np.unique(self.color[:n][alive].astype(np.int32) << 16 | radius, return_inverse=True)
+        sprites = np.empty(len(looks), dtype=object)
+        offsets = np.empty(len(looks), dtype=np.int32)
+        for i, look in enumerate(looks.tolist()):
+            sprites[i], offsets[i] = atlas.circle(self.palette[look >> 16], look & 0xFFFF)
+        offset = offsets[inverse]
+        positions = np.stack((self.x[:n][alive].astype(np.int32) - (offset + ox),
+                              self.y[:n][alive].astype(np.int32) - (offset + oy)), axis=1)
+        screen.blits(zip(sprites[inverse].tolist(), positions.tolist()), False)
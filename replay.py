@@ -0,0 +1,116 @@
+import argparse
+import json
+import time
+import pygame
+from engine import FrameInput, GameEngine, KeySet
+from player import create_player, player_type_key
+from camera import SCREEN_WIDTH, SCREEN_HEIGHT
+from projectile import WIDTH, HEIGHT
+
+TRACKED_KEYS = (
+    pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d,
+    pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT,
+)
+
+class InputRecorder:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+        self.pending = []
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def reset(self, engine):
+        self.pending = []
+        self.write({"reset": player_type_key(engine.player), "seed": engine.seed, "world": [WIDTH, HEIGHT]})
+
+    def action(self, action):
+        self.pending.append(action)
+
+    def record(self, frame, state_hash):
+        keys = frame.keys
+        entry = {
+            "k": [key for key in TRACKED_KEYS if keys[key]],
+            "m": list(frame.mouse_pos),
+            "b": int(bool(frame.mouse_held)),
+            "h": state_hash,
+        }
+        if self.pending:
+            entry["a"] = self.pending
+            self.pending = []
+        self.write(entry)
+
+    def close(self):
+        self.file.close()
+
+def load_log(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class InputReplayer:
+    def __init__(self, entries, check=True):
+        self.entries = entries
+        self.check = check
+        self.position = 0
+        self.engine = None
+        self.ticks = 0
+        self.divergence = None
+
+    def step(self):
+        while self.position < len(self.entries):
+            entry = self.entries[self.position]
+            self.position += 1
+            
+            if "reset" in entry:
+                if entry.get("world", [800, 600]) != [WIDTH, HEIGHT]:
+                    raise ValueError(f"log was recorded in a {entry['world'][0]}x{entry['world'][1]} world; "
+                                     f"set SHOOTER_WORLD to match")
+                player = create_player(entry["reset"], WIDTH // 2, HEIGHT // 2)
+                if self.engine is None:
+                    self.engine = GameEngine(player, seed=entry["seed"])
+                else:
+                    self.engine.reset(player)
+                continue
+            
+            engine = self.engine
+            for action in entry.get("a", ()):
+                engine.apply_action(action)
+            engine.step(FrameInput(KeySet(entry["k"]), tuple(entry["m"]), bool(entry["b"])))
+            self.ticks += 1
+            
+            if self.check and self.divergence is None and engine.state_hash() != entry["h"]:
+                self.divergence = self.ticks - 1
+            return True
+        return False
+
+def replay(path, check=True, surface=None):
+    replayer = InputReplayer(load_log(path), check)
+    while replayer.step():
+        if surface is not None:
+            surface.fill((0, 0, 0))
+            replayer.engine.render(surface)
+    return replayer
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded input log and verify per-tick state hashes.")
+    parser.add_argument("log")
+    parser.add_argument("--render", action="store_true", help="draw every tick into an off-screen surface")
+    parser.add_argument("--no-check", action="store_true", help="skip state hash comparison")
+    args = parser.parse_args()
+    
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) if args.render else None
+    start = time.perf_counter()
+    replayer = replay(args.log, not args.no_check, surface)
+    elapsed = time.perf_counter() - start
+    
+    print(f"replayed {replayer.ticks} ticks in {elapsed:.2f}s")
+    if args.no_check:
+        return
+    if replayer.divergence is None:
+        print("state hashes match")
+    else:
+        print(f"diverged at tick {replayer.divergence}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,24 @@
+from time import perf_counter
+IMPORT_START = perf_counter()
+
+import json
 import pygame
 import math
+import os
 import random
+from camera import SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, WORLD_HEIGHT
 from enemy import *
+from engine import FrameInput, GameEngine
+from dirty import DirtyRenderer, FullRenderer
+from fonts import load_fonts
+from governor import QualityGovernor
+from player import switch_character
+from profiler import FrameProfiler
 from projectile import *
+from replay import InputRecorder
+from textcache import Hud, render_text
 
-pygame.init()
-
-WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("俯视角射击游戏")
+WIDTH, HEIGHT = SCREEN_WIDTH, SCREEN_HEIGHT
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -22,25 +32,50 @@ CYAN = (0, 255, 255)
 GRAY = (128, 128, 128)
 
 clock = pygame.time.Clock()
-FPS = 60
+FPS = int(os.environ.get("SHOOTER_FPS", 60))
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+MAX_STEPS_PER_FRAME = 5
+FIXED_TIMESTEP = os.environ.get("SHOOTER_TIMESTEP", "fixed") != "frame"
 
-font_names = ["SimHei", "Microsoft YaHei", "SimSun", "Arial"]
+SEED = os.environ.get("SHOOTER_SEED")
+RECORD_PATH = os.environ.get("SHOOTER_RECORD")
+PROFILE_PATH = os.environ.get("SHOOTER_PROFILE")
+DIRTY_RECTS = bool(os.environ.get("SHOOTER_DIRTY"))
+GOVERNOR = os.environ.get("SHOOTER_GOVERNOR", "on") != "off"
+STARTUP_LOG = os.environ.get("SHOOTER_STARTUP_LOG")
+
+screen = None
+font_ui = None
+font_large = None
 font_path = None
-for font_name in font_names:
-    try:
-        font = pygame.font.SysFont(font_name, 36)
-        test_text = font.render("测试", True, WHITE)
-        font_path = font_name
-        break
-    except:
-        continue
+startup = {"import_ms": (perf_counter() - IMPORT_START) * 1000}
+
+hud = Hud()
 
-if font_path:
-    font_ui = pygame.font.SysFont(font_path, 36)
-    font_large = pygame.font.SysFont(font_path, 72)
-else:
-    font_ui = pygame.font.Font(None, 36)
-    font_large = pygame.font.Font(None, 72)
+def init_display():
+    global screen, font_ui, font_large, font_path
+    start = perf_counter()
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("俯视角射击游戏")
+    fonts_start = perf_counter()
+    (font_ui, font_large), font_path, cached = load_fonts((36, 72))
+    end = perf_counter()
+    startup["display_ms"] = (fonts_start - start) * 1000
+    startup["fonts_ms"] = (end - fonts_start) * 1000
+    startup["font_cached"] = cached
+    startup["font"] = font_path
+
+def report_startup():
+    startup["first_frame_ms"] = (perf_counter() - IMPORT_START) * 1000
+    print(f"startup: first frame {startup['first_frame_ms']:.0f} ms after import "
+          f"(import {startup['import_ms']:.0f} ms, display {startup['display_ms']:.0f} ms, "
+          f"fonts {startup['fonts_ms']:.0f} ms{' cached' if startup['font_cached'] else ''})")
+    if STARTUP_LOG:
+        with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps({name: round(value, 2) if isinstance(value, float) else value
+                                for name, value in startup.items()}, ensure_ascii=False) + "\n")
 
 class Player:
     def __init__(self, x, y):
@@ -136,54 +171,61 @@ class Player:
         if self.fire_cooldown > 0:
             self.fire_cooldown -= 1
 
-def draw_ui(screen, player):
-    score_text = font_ui.render(f"分数: {player.score}", True, WHITE)
-    screen.blit(score_text, (10, 10))
+def draw_ui(screen, player, quality=0):
+    rects = []
+    score_text = hud.line("score", font_ui, "分数: {}", WHITE, player.score)
+    rects.append(screen.blit(score_text, (10, 10)))
     
-    health_text = font_ui.render(f"生命值: {player.health}/{player.max_health}", True, WHITE)
-    screen.blit(health_text, (10, 50))
+    health_text = hud.line("health", font_ui, "生命值: {}/{}", WHITE, player.health, player.max_health)
+    rects.append(screen.blit(health_text, (10, 50)))
     
     health_bar_width = 200
     health_bar_height = 20
     health_percentage = player.health / player.max_health
-    pygame.draw.rect(screen, GRAY, (10, 90, health_bar_width, health_bar_height))
+    rects.append(pygame.draw.rect(screen, GRAY, (10, 90, health_bar_width, health_bar_height)))
     pygame.draw.rect(screen, GREEN, (10, 90, health_bar_width * health_percentage, health_bar_height))
     
-    level_text = font_ui.render(f"等级: {player.level}", True, WHITE)
-    screen.blit(level_text, (10, 120))
+    level_text = hud.line("level", font_ui, "等级: {}", WHITE, player.level)
+    rects.append(screen.blit(level_text, (10, 120)))
     
-    exp_text = font_ui.render(f"经验: {player.experience}/{player.experience_to_next_level}", True, WHITE)
-    screen.blit(exp_text, (10, 160))
+    exp_text = hud.line("experience", font_ui, "经验: {}/{}", WHITE, player.experience, player.experience_to_next_level)
+    rects.append(screen.blit(exp_text, (10, 160)))
     
     exp_bar_width = 200
     exp_bar_height = 15
     exp_percentage = player.experience / player.experience_to_next_level
-    pygame.draw.rect(screen, GRAY, (10, 200, exp_bar_width, exp_bar_height))
+    rects.append(pygame.draw.rect(screen, GRAY, (10, 200, exp_bar_width, exp_bar_height)))
     pygame.draw.rect(screen, BLUE, (10, 200, exp_bar_width * exp_percentage, exp_bar_height))
     
     if player.upgrade_points > 0:
-        upgrade_text = font_ui.render(f"升级点: {player.upgrade_points} (按U升级)", True, YELLOW)
-        screen.blit(upgrade_text, (10, 230))
+        upgrade_text = hud.line("upgrade_points", font_ui, "升级点: {} (按U升级)", YELLOW, player.upgrade_points)
+        rects.append(screen.blit(upgrade_text, (10, 230)))
     
     if hasattr(player, 'player_type'):
-        type_text = font_ui.render(f"角色: {player.player_type}", True, CYAN)
-        screen.blit(type_text, (10, 260))
+        type_text = hud.line("player_type", font_ui, "角色: {}", CYAN, player.player_type)
+        rects.append(screen.blit(type_text, (10, 260)))
+    
+    if quality:
+        quality_text = hud.line("quality", font_ui, "画质降级: {}", ORANGE, quality)
+        rects.append(screen.blit(quality_text, (10, 300)))
+    
+    return rects
 
 def upgrade_screen(screen, player):
     from player import PLAYER_TYPES, create_player
     
     screen.fill((30, 30, 30))
     
-    title_text = font_large.render("升级界面", True, WHITE)
+    title_text = render_text(font_large, "升级界面", WHITE)
     screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 30))
     
-    points_text = font_ui.render(f"可用升级点: {player.upgrade_points}", True, YELLOW)
+    points_text = render_text(font_ui, f"可用升级点: {player.upgrade_points}", YELLOW)
     screen.blit(points_text, (WIDTH//2 - points_text.get_width()//2, 100))
     
-    type_text = font_ui.render(f"当前角色: {player.player_type}", True, CYAN)
+    type_text = render_text(font_ui, f"当前角色: {player.player_type}", CYAN)
     screen.blit(type_text, (WIDTH//2 - type_text.get_width()//2, 140))
     
-    desc_text = font_ui.render(player.description, True, GRAY)
+    desc_text = render_text(font_ui, player.description, GRAY)
     screen.blit(desc_text, (WIDTH//2 - desc_text.get_width()//2, 175))
     
     upgrade_options = [
@@ -196,8 +238,8 @@ def upgrade_screen(screen, player):
     
     y_offset = 210
     for i, (option, current) in enumerate(upgrade_options):
-        option_text = font_ui.render(option, True, WHITE)
-        current_text = font_ui.render(current, True, GRAY)
+        option_text = render_text(font_ui, option, WHITE)
+        current_text = render_text(font_ui, current, GRAY)
         screen.blit(option_text, (WIDTH//2 - 200, y_offset))
         screen.blit(current_text, (WIDTH//2 + 100, y_offset))
         y_offset += 50
@@ -214,53 +256,37 @@ def upgrade_screen(screen, player):
     pygame.draw.line(screen, GRAY, (100, y_offset), (700, y_offset), 2)
     y_offset += 30
     
-    char_title = font_ui.render("切换角色", True, ORANGE)
+    char_title = render_text(font_ui, "切换角色", ORANGE)
     screen.blit(char_title, (WIDTH//2 - char_title.get_width()//2, y_offset))
     y_offset += 40
     
     for i, (option, desc) in enumerate(character_options):
-        option_text = font_ui.render(option, True, WHITE)
-        desc_text = font_ui.render(desc, True, GRAY)
+        option_text = render_text(font_ui, option, WHITE)
+        desc_text = render_text(font_ui, desc, GRAY)
         screen.blit(option_text, (WIDTH//2 - 200, y_offset))
         screen.blit(desc_text, (WIDTH//2 + 100, y_offset))
         y_offset += 45
     
-    hint_text = font_ui.render("按数字键1-5升级，按0-9切换角色，按ESC返回游戏", True, GREEN)
+    hint_text = render_text(font_ui, "按数字键1-5升级，按0-9切换角色，按ESC返回游戏", GREEN)
     screen.blit(hint_text, (WIDTH//2 - hint_text.get_width()//2, HEIGHT - 50))
 
-def switch_character(player, char_type):
-    from player import create_player
-    new_player = create_player(char_type, player.x, player.y)
-    new_player.health = player.health
-    new_player.max_health = player.max_health
-    new_player.score = player.score
-    new_player.experience = player.experience
-    new_player.level = player.level
-    new_player.experience_to_next_level = player.experience_to_next_level
-    new_player.upgrade_points = player.upgrade_points
-    new_player.speed = player.speed
-    new_player.bullet_speed = player.bullet_speed
-    new_player.bullet_damage = player.bullet_damage
-    new_player.fire_rate = player.fire_rate
-    return new_player
-
 def pause_menu(screen):
     screen.fill((30, 30, 30))
     
-    title_text = font_large.render("游戏暂停", True, WHITE)
+    title_text = render_text(font_large, "游戏暂停", WHITE)
     screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, HEIGHT//2 - 100))
     
-    continue_text = font_ui.render("按 ESC 继续游戏", True, GREEN)
+    continue_text = render_text(font_ui, "按 ESC 继续游戏", GREEN)
     screen.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, HEIGHT//2))
     
-    quit_text = font_ui.render("按 Q 退出游戏", True, RED)
+    quit_text = render_text(font_ui, "按 Q 退出游戏", RED)
     screen.blit(quit_text, (WIDTH//2 - quit_text.get_width()//2, HEIGHT//2 + 60))
 
 def game_over_screen(screen, score):
-    game_over_text = font_large.render("游戏结束", True, RED)
-    score_text = font_ui.render(f"最终分数: {score}", True, WHITE)
-    restart_text = font_ui.render("按 R 重新开始", True, WHITE)
-    quit_text = font_ui.render("按 Q 退出", True, WHITE)
+    game_over_text = render_text(font_large, "游戏结束", RED)
+    score_text = render_text(font_ui, f"最终分数: {score}", WHITE)
+    restart_text = render_text(font_ui, "按 R 重新开始", WHITE)
+    quit_text = render_text(font_ui, "按 Q 退出", WHITE)
     
     screen.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, HEIGHT//2 - 100))
     screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//2))
@@ -268,30 +294,44 @@ def game_over_screen(screen, score):
     screen.blit(quit_text, (WIDTH//2 - quit_text.get_width()//2, HEIGHT//2 + 100))
 
 def main():
-    player = Player(WIDTH // 2, HEIGHT // 2)
-    bullets = []
-    enemies = []
-    enemy_bullets = []
-    
-    enemy_spawn_timer = 0
-    enemy_spawn_delay = 60
-    score_threshold = 0
-    boss_spawned = False
+    if screen is None:
+        init_display()
+    recorder = InputRecorder(RECORD_PATH) if RECORD_PATH else None
+    engine = GameEngine(Player(WORLD_WIDTH // 2, WORLD_HEIGHT // 2), seed=None if SEED is None else int(SEED),
+                        recorder=recorder)
+    profiler = FrameProfiler(engine, PROFILE_PATH)
+    if os.environ.get("SHOOTER_OVERLAY"):
+        profiler.toggle_overlay()
+    if DIRTY_RECTS and not engine.camera.scrolls:
+        renderer = DirtyRenderer(screen, BLACK)
+    else:
+        renderer = FullRenderer(screen, BLACK)
+    engine.keep_previous = FIXED_TIMESTEP
+    governor = QualityGovernor(engine) if GOVERNOR else None
+    accumulator = 0.0
     
-    game_over = False
     upgrade_screen_open = False
     pause_menu_open = False
     mouse_held = False
     
+    first_frame = True
     running = True
     while running:
-        clock.tick(FPS)
+        profiler.begin_frame()
+        frame_ms = clock.tick(FPS)
+        if abs(frame_ms - TICK_MS) < 1:
+            frame_ms = TICK_MS
+        accumulator += frame_ms
+        work_start = perf_counter()
+        profiler.mark("wait")
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
             
-            if not game_over and not upgrade_screen_open and not pause_menu_open:
+            if not engine.game_over and not upgrade_screen_open and not pause_menu_open:
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
                         mouse_held = True
@@ -299,7 +339,7 @@ def main():
                     if event.button == 1:
                         mouse_held = False
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_u and player.upgrade_points > 0:
+                    if event.key == pygame.K_u and engine.player.upgrade_points > 0:
                         upgrade_screen_open = True
                     elif event.key == pygame.K_ESCAPE:
                         pause_menu_open = True
@@ -307,26 +347,26 @@ def main():
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         upgrade_screen_open = False
-                    elif event.key == pygame.K_1 and player.upgrade_points > 0:
-                        player.upgrade_max_health()
-                    elif event.key == pygame.K_2 and player.upgrade_points > 0:
-                        player.upgrade_speed()
-                    elif event.key == pygame.K_3 and player.upgrade_points > 0:
-                        player.upgrade_bullet_speed()
-                    elif event.key == pygame.K_4 and player.upgrade_points > 0:
-                        player.upgrade_bullet_damage()
-                    elif event.key == pygame.K_5 and player.upgrade_points > 0:
-                        player.upgrade_fire_rate()
+                    elif event.key == pygame.K_1 and engine.player.upgrade_points > 0:
+                        engine.apply_action("upgrade_max_health")
+                    elif event.key == pygame.K_2 and engine.player.upgrade_points > 0:
+                        engine.apply_action("upgrade_speed")
+                    elif event.key == pygame.K_3 and engine.player.upgrade_points > 0:
+                        engine.apply_action("upgrade_bullet_speed")
+                    elif event.key == pygame.K_4 and engine.player.upgrade_points > 0:
+                        engine.apply_action("upgrade_bullet_damage")
+                    elif event.key == pygame.K_5 and engine.player.upgrade_points > 0:
+                        engine.apply_action("upgrade_fire_rate")
                     elif event.key == pygame.K_6:
-                        player = switch_character(player, "normal")
+                        engine.apply_action("switch:normal")
                     elif event.key == pygame.K_7:
-                        player = switch_character(player, "shotgun")
+                        engine.apply_action("switch:shotgun")
                     elif event.key == pygame.K_8:
-                        player = switch_character(player, "laser")
+                        engine.apply_action("switch:laser")
                     elif event.key == pygame.K_9:
-                        player = switch_character(player, "missile")
+                        engine.apply_action("switch:missile")
                     elif event.key == pygame.K_0:
-                        player = switch_character(player, "rapid")
+                        engine.apply_action("switch:rapid")
             elif pause_menu_open:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
@@ -337,157 +377,78 @@ def main():
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
                         from player import create_player
-                        player = create_player("normal", WIDTH // 2, HEIGHT // 2)
-                        bullets = []
-                        enemies = []
-                        enemy_bullets = []
-                        enemy_spawn_delay = 60
-                        score_threshold = 0
-                        boss_spawned = False
-                        game_over = False
+                        engine.reset(create_player("normal", WORLD_WIDTH // 2, WORLD_HEIGHT // 2))
                         upgrade_screen_open = False
                         pause_menu_open = False
                         mouse_held = False
                     elif event.key == pygame.K_q:
                         running = False
         
-        if not game_over and not upgrade_screen_open and not pause_menu_open:
-            keys = pygame.key.get_pressed()
-            player.move(keys, WIDTH, HEIGHT)
-            player.aim(pygame.mouse.get_pos())
-            player.update_cooldown()
-            
-            if mouse_held:
-                if hasattr(player, 'shoot'):
-                    if player.player_type == "导弹":
-                        new_bullets = player.shoot(enemies)
-                    elif player.player_type == "激光":
-                        new_bullets = player.shoot(pygame.mouse.get_pos())
-                    else:
-                        new_bullets = player.shoot()
-                    bullets.extend(new_bullets)
-                elif player.can_shoot():
-                    bullet = Bullet(player.x, player.y, player.angle, player.bullet_damage, player.bullet_speed)
-                    bullets.append(bullet)
-            
-            for bullet in bullets[:]:
-                if isinstance(bullet, LaserBeam):
-                    if not bullet.update():
-                        bullets.remove(bullet)
-                else:
-                    bullet.update()
-                    if bullet.is_off_screen():
-                        bullets.remove(bullet)
-            
-            for enemy_bullet in enemy_bullets[:]:
-                enemy_bullet.update()
-                if enemy_bullet.is_off_screen():
-                    enemy_bullets.remove(enemy_bullet)
-            
-            enemy_spawn_timer += 1
-            if enemy_spawn_timer >= enemy_spawn_delay:
-                if player.score >= score_threshold + 200 and not boss_spawned:
-                    enemies.append(spawn_enemy('boss'))
-                    boss_spawned = True
-                    score_threshold = player.score
-                else:
-                    enemies.append(spawn_enemy())
-                enemy_spawn_timer = 0
-                if enemy_spawn_delay > 20:
-                    enemy_spawn_delay -= 0.3
-            
-            for enemy in enemies[:]:
-                enemy.update(player)
-                
-                if hasattr(enemy, 'bullets'):
-                    enemy.update_bullets()
-                    enemy_bullets.extend(enemy.bullets)
-                    enemy.bullets.clear()
-                
-                player_rect = player.get_rect()
-                enemy_rect = enemy.get_rect()
-                
-                if player_rect.colliderect(enemy_rect):
-                    player.health -= enemy.damage
-                    enemies.remove(enemy)
-                    if player.health <= 0:
-                        game_over = True
-            
-            for bullet in bullets[:]:
-                if isinstance(bullet, LaserBeam):
-                    bullet.hit_enemies.clear()
-                    for enemy in enemies[:]:
-                        if enemy not in bullet.hit_enemies and bullet.check_circle_collision(enemy.x, enemy.y, enemy.radius):
-                            enemy.health -= bullet.damage
-                            bullet.hit_enemies.add(enemy)
-                            if enemy.health <= 0:
-                                if enemy in enemies:
-                                    enemies.remove(enemy)
-                                player.score += enemy.score_value
-                                player.add_experience(enemy.score_value)
-                                if isinstance(enemy, BossEnemy):
-                                    boss_spawned = False
-                else:
-                    bullet_rect = bullet.get_rect()
-                    for enemy in enemies[:]:
-                        enemy_rect = enemy.get_rect()
-                        if bullet_rect.colliderect(enemy_rect):
-                            enemy.health -= bullet.damage
-                            bullets.remove(bullet)
-                            if enemy.health <= 0:
-                                if enemy in enemies:
-                                    enemies.remove(enemy)
-                                player.score += enemy.score_value
-                                player.add_experience(enemy.score_value)
-                                if isinstance(enemy, BossEnemy):
-                                    boss_spawned = False
-                            break
-            
-            for enemy_bullet in enemy_bullets[:]:
-                bullet_rect = enemy_bullet.get_rect()
-                player_rect = player.get_rect()
-                if bullet_rect.colliderect(player_rect):
-                    player.health -= enemy_bullet.damage
-                    enemy_bullets.remove(enemy_bullet)
-                    if player.health <= 0:
-                        game_over = True
+        profiler.mark("events")
         
-        screen.fill(BLACK)
+        if engine.game_over or upgrade_screen_open or pause_menu_open:
+            accumulator = 0.0
+        elif not FIXED_TIMESTEP:
+            engine.step(FrameInput(pygame.key.get_pressed(), engine.camera.to_world(pygame.mouse.get_pos()), mouse_held))
+            profiler.resume()
+        else:
+            frame = FrameInput(pygame.key.get_pressed(), engine.camera.to_world(pygame.mouse.get_pos()), mouse_held)
+            steps = 0
+            while accumulator >= TICK_MS and steps < MAX_STEPS_PER_FRAME and not engine.game_over:
+                engine.step(frame)
+                accumulator -= TICK_MS
+                steps += 1
+            if steps == MAX_STEPS_PER_FRAME:
+                accumulator = min(accumulator, TICK_MS)
+            profiler.resume()
         
         if upgrade_screen_open:
-            upgrade_screen(screen, player)
+            static_screen = ("upgrade", engine.player, engine.player.upgrade_points)
         elif pause_menu_open:
-            player.draw(screen)
-            
-            for bullet in bullets:
-                bullet.draw(screen)
-            
-            for enemy_bullet in enemy_bullets:
-                enemy_bullet.draw(screen)
-            
-            for enemy in enemies:
-                enemy.draw(screen)
-            
-            draw_ui(screen, player)
-            pause_menu(screen)
-        elif not game_over:
-            player.draw(screen)
-            
-            for bullet in bullets:
-                bullet.draw(screen)
-            
-            for enemy_bullet in enemy_bullets:
-                enemy_bullet.draw(screen)
-            
-            for enemy in enemies:
-                enemy.draw(screen)
-            
-            draw_ui(screen, player)
+            static_screen = ("pause",)
+        elif engine.game_over:
+            static_screen = ("game_over", engine.player.score)
         else:
-            game_over_screen(screen, player.score)
+            static_screen = None
         
-        pygame.display.flip()
+        if static_screen is None:
+            renderer.clear()
+            if FIXED_TIMESTEP:
+                engine.blend(accumulator / TICK_MS)
+            engine.render(screen)
+            rects = engine.dirty_rects() if renderer.tracks_rects else []
+            engine.unblend()
+            profiler.mark("render")
+            rects.extend(draw_ui(screen, engine.player, engine.quality))
+            profiler.mark("ui")
+            overlay_rect = profiler.draw(screen)
+            profiler.mark("overlay")
+            if overlay_rect is not None and renderer.tracks_rects:
+                rects.append(overlay_rect)
+            renderer.present(rects)
+        elif renderer.static_changed(static_screen) or profiler.overlay:
+            screen.fill(BLACK)
+            if upgrade_screen_open:
+                upgrade_screen(screen, engine.player)
+            elif pause_menu_open:
+                pause_menu(screen)
+            else:
+                game_over_screen(screen, engine.player.score)
+            profiler.mark("ui")
+            profiler.draw(screen)
+            profiler.mark("overlay")
+            renderer.flip()
+        profiler.mark("flip")
+        profiler.end_frame()
+        if governor is not None and static_screen is None:
+            governor.frame((perf_counter() - work_start) * 1000)
+        if first_frame:
+            first_frame = False
+            report_startup()
     
+    profiler.close()
+    if recorder is not None:
+        recorder.close()
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+import numpy as np
+from ecs import Table
+
+class EnemyGuns(Table):
+    columns = ("shoot_cooldown", "shoot_delay", "shoot_range", "ai_slot")
+    flags = ("scripted",)
+    attributes = columns
+
+    def load(self, entity, i):
+        self.scripted[i] = entity.scripted_attack
+
+    def step(self, player, chasers, emitter, tick=0, slices=1):
+        self.compact()
+        n = self.count
+        if not n:
+            return
+        
+        entities = self.entities
+        rows = chasers.rows
+        index = np.fromiter((rows[enemy] for enemy in entities), np.intp, n)
+        distance = chasers.distance[index]
+        cooldown = self.shoot_cooldown[:n]
+        scripted = self.scripted[:n]
+        plain = ~scripted
+        cooldown[plain] -= 1
+        ready = plain & (cooldown <= 0) & (distance <= self.shoot_range[:n])
+        if slices > 1:
+            ready &= (tick + self.ai_slot[:n]) % slices == 0
+        
+        for i in np.flatnonzero(ready | scripted).tolist():
+            enemy = entities[i]
+            if ready[i]:
+                enemy.shoot(player, emitter)
+                cooldown[i] = self.shoot_delay[i]
+            else:
+                enemy.act(player, distance[i].item(), emitter)
+                cooldown[i] = enemy.shoot_cooldown
+                chasers.speed[index[i]] = enemy.speed
+        
+        for enemy, value in zip(entities, cooldown.astype(np.int64).tolist()):
+            enemy.shoot_cooldown = value
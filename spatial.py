@@ -0,0 +1,241 @@
+import math
+import numpy as np
+
+CELL_SIZE = 80
+
+def nearest(entities, x, y, max_distance=math.inf):
+    target = None
+    min_distance = max_distance
+    for entity in entities:
+        distance = math.sqrt((entity.x - x)**2 + (entity.y - y)**2)
+        if distance < min_distance:
+            min_distance = distance
+            target = entity
+    return target
+
+NEIGHBOR_OFFSETS = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+def neighbor_pairs(x, y, radius):
+    n = len(x)
+    if n < 2:
+        empty = np.zeros(0, dtype=np.int32)
+        return empty, empty, np.zeros(0), np.zeros(0)
+    cx = np.floor(x / radius).astype(np.int32)
+    cy = np.floor(y / radius).astype(np.int32)
+    cx -= cx.min()
+    cy -= cy.min() - 1
+    rows = int(cy.max()) + 2
+    key = cx * rows + cy
+    order = np.argsort(key, kind="stable").astype(np.int32)
+    key = key[order]
+    xs = x[order]
+    ys = y[order]
+    occupancy = np.bincount(key, minlength=(int(cx.max()) + 2) * rows)
+    first = (np.cumsum(occupancy) - occupancy).astype(np.int32)
+    
+    rank = np.arange(n, dtype=np.int32)
+    starts = [rank + 1]
+    stops = [first[key] + occupancy[key]]
+    for ox, oy in NEIGHBOR_OFFSETS[1:]:
+        probe = key + (ox * rows + oy)
+        starts.append(first[probe])
+        stops.append(first[probe] + occupancy[probe])
+    start = np.concatenate(starts)
+    counts = np.concatenate(stops) - start
+    run_start = np.cumsum(counts) - counts
+    stencil = len(NEIGHBOR_OFFSETS)
+    i = np.repeat(np.tile(order, stencil), counts)
+    j = np.repeat((start - run_start).astype(np.int32), counts)
+    j += np.arange(len(j), dtype=np.int32)
+    
+    dx = xs.take(j) - np.repeat(np.tile(xs, stencil), counts)
+    dy = ys.take(j) - np.repeat(np.tile(ys, stencil), counts)
+    keep = np.flatnonzero(dx * dx + dy * dy < radius * radius)
+    return i.take(keep), order.take(j.take(keep)), dx.take(keep), dy.take(keep)
+
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+        self.max_radius = 0
+        self.counter = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+        self.max_radius = 0
+        self.counter = 0
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, entity):
+        key = self.cell_of(entity.x, entity.y)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = []
+        cell.append(entity)
+        self.entries[entity] = (key, self.counter)
+        self.counter += 1
+        if entity.radius > self.max_radius:
+            self.max_radius = entity.radius
+
+    def rebuild(self, entities):
+        self.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def discard(self, entity):
+        entry = self.entries.pop(entity, None)
+        if entry is None:
+            return
+        cell = self.cells[entry[0]]
+        cell.remove(entity)
+        if not cell:
+            del self.cells[entry[0]]
+
+    def query(self, x, y, radius):
+        reach = radius + self.max_radius + 2
+        size = self.cell_size
+        min_cx = int((x - reach) // size)
+        max_cx = int((x + reach) // size)
+        min_cy = int((y - reach) // size)
+        max_cy = int((y + reach) // size)
+
+        cells = self.cells
+        candidates = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    candidates.extend(cell)
+
+        if len(candidates) > 1:
+            entries = self.entries
+            candidates.sort(key=lambda entity: entries[entity][1])
+        return candidates
+
+    def query_rect(self, min_x, min_y, max_x, max_y):
+        reach = self.max_radius + 2
+        size = self.cell_size
+        min_cx = int((min_x - reach) // size)
+        max_cx = int((max_x + reach) // size)
+        min_cy = int((min_y - reach) // size)
+        max_cy = int((max_y + reach) // size)
+        
+        cells = self.cells
+        candidates = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    candidates.extend(cell)
+        
+        if len(candidates) > 1:
+            entries = self.entries
+            candidates.sort(key=lambda entity: entries[entity][1])
+        return candidates
+
+    def query_segment(self, x0, y0, x1, y1, radius=0):
+        cells = self.cells
+        if not cells:
+            return []
+        size = self.cell_size
+        step = size / 2
+        span = int(math.ceil((radius + self.max_radius + 2 + step / 2) / size))
+        samples = int(math.hypot(x1 - x0, y1 - y0) // step) + 1
+        
+        keys = set()
+        for i in range(samples + 1):
+            t = i / samples
+            cx = int((x0 + (x1 - x0) * t) // size)
+            cy = int((y0 + (y1 - y0) * t) // size)
+            for ox in range(cx - span, cx + span + 1):
+                for oy in range(cy - span, cy + span + 1):
+                    keys.add((ox, oy))
+        
+        candidates = []
+        for key in keys:
+            cell = cells.get(key)
+            if cell:
+                candidates.extend(cell)
+        if len(candidates) > 1:
+            entries = self.entries
+            candidates.sort(key=lambda entity: entries[entity][1])
+        return candidates
+
+    def ring(self, cx, cy, radius):
+        if radius == 0:
+            yield cx, cy
+            return
+        for ox in range(-radius, radius + 1):
+            yield cx + ox, cy - radius
+            yield cx + ox, cy + radius
+        for oy in range(-radius + 1, radius):
+            yield cx - radius, cy + oy
+            yield cx + radius, cy + oy
+
+    def k_nearest(self, x, y, k=1, max_distance=math.inf):
+        cells = self.cells
+        if not cells or k <= 0:
+            return []
+        size = self.cell_size
+        cx, cy = self.cell_of(x, y)
+        if max_distance == math.inf:
+            max_ring = max(max(abs(key[0] - cx), abs(key[1] - cy)) for key in cells)
+        else:
+            max_ring = int(max_distance // size) + 1
+        
+        entries = self.entries
+        found = []
+        bound = max_distance
+        radius = 0
+        while radius <= max_ring and (radius - 1) * size <= bound:
+            for key in self.ring(cx, cy, radius):
+                cell = cells.get(key)
+                if not cell:
+                    continue
+                for entity in cell:
+                    distance = math.sqrt((entity.x - x)**2 + (entity.y - y)**2)
+                    if distance < max_distance and distance <= bound:
+                        found.append((distance, entries[entity][1], entity))
+            if len(found) >= k:
+                found.sort(key=lambda item: (item[0], item[1]))
+                del found[k:]
+                bound = found[-1][0]
+            radius += 1
+        found.sort(key=lambda item: (item[0], item[1]))
+        return [entity for _, _, entity in found[:k]]
+
+    def nearest(self, x, y, max_distance=math.inf):
+        found = self.k_nearest(x, y, 1, max_distance)
+        return found[0] if found else None
+
+    def near_mask(self, xs, ys, radius):
+        mask = np.zeros(len(xs), dtype=bool)
+        if not self.cells or not len(xs):
+            return mask
+        
+        size = self.cell_size
+        span = int(math.ceil((radius + self.max_radius + 2) / size))
+        offsets = np.array([(ox, oy) for ox in range(-span, span + 1)
+                            for oy in range(-span, span + 1)], dtype=np.int64)
+        keys = np.array(list(self.cells), dtype=np.int64)
+        keys = (keys[:, None, :] + offsets[None, :, :]).reshape(-1, 2)
+        origin = keys.min(axis=0)
+        shape = keys.max(axis=0) - origin + 1
+        occupied = np.zeros(shape, dtype=bool)
+        occupied[keys[:, 0] - origin[0], keys[:, 1] - origin[1]] = True
+        
+        cx = np.floor(np.asarray(xs) / size).astype(np.int64) - origin[0]
+        cy = np.floor(np.asarray(ys) / size).astype(np.int64) - origin[1]
+        inside = (cx >= 0) & (cx < shape[0]) & (cy >= 0) & (cy < shape[1])
+        mask[inside] = occupied[cx[inside], cy[inside]]
+        return mask
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entity):
+        return entity in self.entries
@@ -0,0 +1,89 @@
+from itertools import chain, islice
+from operator import attrgetter
+import numpy as np
+import pygame
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GRAY = (128, 128, 128)
+COLORKEY = (255, 0, 255)
+
+get_x = attrgetter("x")
+get_y = attrgetter("y")
+
+class SpriteAtlas:
+    def __init__(self):
+        self.circles = {}
+        self.bars = {}
+
+    def finish(self, surface, colorkey=None):
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        if colorkey is not None:
+            surface.set_colorkey(colorkey, pygame.RLEACCEL)
+        return surface
+
+    def circle(self, color, radius, outline=None, outline_color=BLACK):
+        key = (color, radius, outline, outline_color)
+        sprite = self.circles.get(key)
+        if sprite is None:
+            size = radius * 2 + 2
+            center = (radius + 1, radius + 1)
+            surface = pygame.Surface((size, size))
+            surface.fill(COLORKEY)
+            pygame.draw.circle(surface, color, center, radius)
+            if outline is not None:
+                inset, width = outline
+                pygame.draw.circle(surface, outline_color, center, radius - inset, width)
+            sprite = self.circles[key] = (self.finish(surface, COLORKEY), radius + 1)
+        return sprite
+
+    def bar(self, width, height, color, filled):
+        key = (width, height, color, filled)
+        surface = self.bars.get(key)
+        if surface is None:
+            surface = pygame.Surface((width, height))
+            surface.fill(GRAY)
+            if filled > 0:
+                surface.fill(color, (0, 0, filled, height))
+            surface = self.bars[key] = self.finish(surface)
+        return surface
+
+    def enemy_sprites(self, enemies, bars, detail=True):
+        enemies = list(enemies)
+        count = len(enemies)
+        if not count:
+            return ()
+        types = list(map(type, enemies))
+        kinds = {cls: i for i, cls in enumerate(dict.fromkeys(types))}
+        looks = np.fromiter(map(kinds.__getitem__, types), np.intp, count)
+        x = np.fromiter(map(get_x, enemies), np.float64, count).astype(np.int32)
+        y = np.fromiter(map(get_y, enemies), np.float64, count).astype(np.int32)
+        sprites = np.empty(len(kinds), dtype=object)
+        offsets = np.empty(len(kinds), dtype=np.int32)
+        for cls, i in kinds.items():
+            sprites[i], offsets[i] = self.circle(cls.color, cls.radius, cls.outline if detail else None)
+        offset = offsets[looks]
+        batch = zip(sprites[looks].tolist(), zip((x - offset).tolist(), (y - offset).tolist()))
+        
+        if detail:
+            barred = [i for cls, i in kinds.items() if cls.health_bar is not None]
+            if barred:
+                segments = []
+                append = segments.append
+                drawn = 0
+                for i in np.flatnonzero(np.isin(looks, barred)).tolist():
+                    append(islice(batch, i + 1 - drawn))
+                    drawn = i + 1
+                    enemy = enemies[i]
+                    health = enemy.health
+                    bar = bars.get(enemy)
+                    if bar is None or bar[0] != health:
+                        bar_width, bar_height, offset, color = enemy.health_bar
+                        filled = min(bar_width, int(bar_width * health / enemy.max_health))
+                        bar = bars[enemy] = (health, self.bar(bar_width, bar_height, color, filled),
+                                             bar_width // 2, enemy.radius + offset)
+                    append(((bar[1], (int(enemy.x - bar[2]), int(enemy.y - bar[3]))),))
+                append(batch)
+                return chain.from_iterable(segments)
+        return batch
@@ -0,0 +1,205 @@
+import math
+import numpy as np
+from ecs import Table
+from spatial import NEIGHBOR_OFFSETS, neighbor_pairs
+
+FLOCK_RADIUS = 48
+SEPARATION_RADIUS = 30
+SEPARATION = 6
+ALIGNMENT = 0.08
+COHESION = 0.01
+ATTRACTION = 0.15
+
+class ChaseSteering(Table):
+    columns = ("x", "y", "speed", "standoff", "distance")
+    attributes = ("x", "y", "speed", "standoff")
+
+    def step(self, player):
+        self.compact()
+        n = self.count
+        if not n:
+            return
+        
+        x = self.x[:n]
+        y = self.y[:n]
+        speed = self.speed[:n]
+        dx = player.x - x
+        dy = player.y - y
+        distance = self.distance[:n]
+        np.sqrt(np.float_power(dx, 2) + np.float_power(dy, 2), out=distance)
+        
+        moving = distance > self.standoff[:n]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x += np.where(moving, (dx / distance) * speed, 0.0)
+            y += np.where(moving, (dy / distance) * speed, 0.0)
+        
+        for enemy, new_x, new_y in zip(self.entities, x.tolist(), y.tolist()):
+            enemy.x = new_x
+            enemy.y = new_y
+
+class WanderSteering(Table):
+    columns = ("x", "y", "speed", "change_direction_timer", "change_direction_delay", "target_x", "target_y",
+               "ai_slot")
+    attributes = columns
+
+    def step(self, tick=0, slices=1):
+        self.compact()
+        n = self.count
+        if not n:
+            return
+        
+        entities = self.entities
+        x = self.x[:n]
+        y = self.y[:n]
+        target_x = self.target_x[:n]
+        target_y = self.target_y[:n]
+        timer = self.change_direction_timer[:n]
+        timer -= 1
+        due = timer <= 0
+        if slices > 1:
+            due &= (tick + self.ai_slot[:n]) % slices == 0
+        for i in np.flatnonzero(due).tolist():
+            rng = entities[i].rng
+            timer[i] = self.change_direction_delay[i]
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = rng.uniform(50, 150)
+            target_x[i] = x[i] + math.cos(angle) * distance
+            target_y[i] = y[i] + math.sin(angle) * distance
+        
+        dx = target_x - x
+        dy = target_y - y
+        distance = np.sqrt(np.float_power(dx, 2) + np.float_power(dy, 2))
+        moving = distance > 5
+        speed = self.speed[:n]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x += np.where(moving, (dx / distance) * speed, 0.0)
+            y += np.where(moving, (dy / distance) * speed, 0.0)
+        
+        rows = zip(entities, x.tolist(), y.tolist(), target_x.tolist(), target_y.tolist(),
+                   timer.astype(np.int64).tolist())
+        for enemy, new_x, new_y, new_target_x, new_target_y, new_timer in rows:
+            enemy.x = new_x
+            enemy.y = new_y
+            enemy.target_x = new_target_x
+            enemy.target_y = new_target_y
+            enemy.change_direction_timer = new_timer
+
+class FlockSteering(Table):
+    columns = ("x", "y", "vx", "vy", "speed")
+    attributes = columns
+
+    def step(self, player):
+        self.compact()
+        n = self.count
+        if not n:
+            return
+        
+        x = self.x[:n]
+        y = self.y[:n]
+        vx = self.vx[:n]
+        vy = self.vy[:n]
+        speed = self.speed[:n]
+        i, j, dx, dy = neighbor_pairs(x, y, FLOCK_RADIUS)
+        both = np.concatenate((i, j))
+        neighbors = np.bincount(both, minlength=n)
+        distance = np.sqrt(dx * dx + dy * dy)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            push = np.where((distance > 0) & (distance < SEPARATION_RADIUS),
+                            (1 - distance / SEPARATION_RADIUS) / distance, 0.0)
+            share = (1.0 / neighbors).take(both)
+            pull = COHESION * share - np.concatenate((push, push)) * SEPARATION
+            align = ALIGNMENT * share
+            other = np.concatenate((j, i))
+            steer_x = np.bincount(both, np.concatenate((dx, -dx)) * pull + vx.take(other) * align, n)
+            steer_y = np.bincount(both, np.concatenate((dy, -dy)) * pull + vy.take(other) * align, n)
+            
+            to_player_x = player.x - x
+            to_player_y = player.y - y
+            reach = np.sqrt(to_player_x * to_player_x + to_player_y * to_player_y)
+            attract_x = np.where(reach > 0, to_player_x / reach, 0.0)
+            attract_y = np.where(reach > 0, to_player_y / reach, 0.0)
+            
+            new_vx = vx + steer_x + attract_x * ATTRACTION
+            new_vy = vy + steer_y + attract_y * ATTRACTION
+            flocking = neighbors > 0
+            np.subtract(new_vx, vx * ALIGNMENT, out=new_vx, where=flocking)
+            np.subtract(new_vy, vy * ALIGNMENT, out=new_vy, where=flocking)
+            
+            norm = np.sqrt(new_vx * new_vx + new_vy * new_vy)
+            fast = norm > speed
+            vx[:] = np.where(fast, new_vx / norm * speed, new_vx)
+            vy[:] = np.where(fast, new_vy / norm * speed, new_vy)
+        x += vx
+        y += vy
+        
+        for enemy, new_x, new_y in zip(self.entities, x.tolist(), y.tolist()):
+            enemy.x = new_x
+            enemy.y = new_y
+
+def flock(boids, player):
+    cells = {}
+    keys = []
+    for index, boid in enumerate(boids):
+        key = (math.floor(boid.x / FLOCK_RADIUS), math.floor(boid.y / FLOCK_RADIUS))
+        cells.setdefault(key, []).append(index)
+        keys.append(key)
+    
+    ranked = sorted(range(len(boids)), key=keys.__getitem__)
+    pairs = []
+    for ox, oy in NEIGHBOR_OFFSETS:
+        for a in ranked:
+            cx, cy = keys[a]
+            for b in cells.get((cx + ox, cy + oy), ()):
+                if ox == oy == 0 and b <= a:
+                    continue
+                dx = boids[b].x - boids[a].x
+                dy = boids[b].y - boids[a].y
+                if dx * dx + dy * dy < FLOCK_RADIUS * FLOCK_RADIUS:
+                    pairs.append((a, b, dx, dy))
+    
+    n = len(boids)
+    neighbors = [0] * n
+    for a, b, dx, dy in pairs:
+        neighbors[a] += 1
+        neighbors[b] += 1
+    steer = [[0.0, 0.0] for _ in range(n)]
+    for side in (0, 1):
+        for a, b, dx, dy in pairs:
+            if side:
+                a, b, dx, dy = b, a, -dx, -dy
+            other = boids[b]
+            distance = math.sqrt(dx * dx + dy * dy)
+            push = (1 - distance / SEPARATION_RADIUS) / distance if 0 < distance < SEPARATION_RADIUS else 0.0
+            share = 1.0 / neighbors[a]
+            pull = COHESION * share - push * SEPARATION
+            align = ALIGNMENT * share
+            total = steer[a]
+            total[0] += dx * pull + other.vx * align
+            total[1] += dy * pull + other.vy * align
+    
+    velocities = []
+    for boid, count, (steer_x, steer_y) in zip(boids, neighbors, steer):
+        x, y, vx, vy = boid.x, boid.y, boid.vx, boid.vy
+        to_player_x = player.x - x
+        to_player_y = player.y - y
+        reach = math.sqrt(to_player_x * to_player_x + to_player_y * to_player_y)
+        attract_x = to_player_x / reach if reach > 0 else 0.0
+        attract_y = to_player_y / reach if reach > 0 else 0.0
+        
+        new_vx = vx + steer_x + attract_x * ATTRACTION
+        new_vy = vy + steer_y + attract_y * ATTRACTION
+        if count:
+            new_vx -= vx * ALIGNMENT
+            new_vy -= vy * ALIGNMENT
+        
+        norm = math.sqrt(new_vx * new_vx + new_vy * new_vy)
+        if norm > boid.speed:
+            new_vx = new_vx / norm * boid.speed
+            new_vy = new_vy / norm * boid.speed
+        velocities.append((new_vx, new_vy))
+    
+    for boid, (vx, vy) in zip(boids, velocities):
+        boid.vx = vx
+        boid.vy = vy
+        boid.x += vx
+        boid.y += vy
@@ -0,0 +1,276 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+from time import perf_counter_ns
+import numpy as np
+import pygame
+import engine as engine_module
+from engine import STAGES, GameEngine
+from enemy import (BossEnemy, Enemy, EnemyBullet, FastEnemy, ShooterEnemy, SwarmEnemy, TankEnemy,
+                   WanderingEnemy)
+from headless import SCRIPTS
+from player import create_player
+from pool import acquire, release
+from camera import SCREEN_WIDTH, SCREEN_HEIGHT
+from projectile import WIDTH, HEIGHT, Bullet, LaserBeam, Missile
+
+ENEMY_TYPES = {
+    "normal": Enemy,
+    "fast": FastEnemy,
+    "tank": TankEnemy,
+    "shooter": ShooterEnemy,
+    "wandering": WanderingEnemy,
+    "swarm": SwarmEnemy,
+    "boss": BossEnemy,
+}
+
+PROJECTILE_KINDS = ("bullet", "enemy_bullet", "laser", "missile")
+SAFE_DISTANCE = 200
+
+PRESETS = {
+    "100": {
+        "enemies": {"normal": 20, "fast": 10, "tank": 5, "shooter": 5, "wandering": 10, "swarm": 9, "boss": 1},
+        "projectiles": {"bullet": 25, "enemy_bullet": 10, "laser": 1, "missile": 4},
+    },
+    "1000": {
+        "enemies": {"normal": 100, "fast": 60, "tank": 30, "shooter": 40, "wandering": 60, "swarm": 108, "boss": 2},
+        "projectiles": {"bullet": 400, "enemy_bullet": 160, "laser": 5, "missile": 35},
+    },
+    "10000": {
+        "enemies": {"normal": 600, "fast": 400, "tank": 200, "shooter": 200, "wandering": 400, "swarm": 996, "boss": 4},
+        "projectiles": {"bullet": 5000, "enemy_bullet": 3000, "laser": 20, "missile": 180},
+    },
+}
+
+class PinnedEngine(GameEngine):
+    def __init__(self, enemy_counts, projectile_counts, seed=0):
+        self.enemy_counts = {ENEMY_TYPES[name]: count for name, count in enemy_counts.items()}
+        self.projectile_counts = projectile_counts
+        self.placement_rng = random.Random(f"{seed}:placement")
+        self.live = {cls: 0 for cls in self.enemy_counts}
+        super().__init__(create_player("normal", WIDTH // 2, HEIGHT // 2), seed=seed)
+        self.spawn_enemies()
+
+    def away_from_player(self):
+        rng = self.placement_rng
+        player = self.player
+        while True:
+            x = rng.uniform(0, WIDTH)
+            y = rng.uniform(0, HEIGHT)
+            if math.hypot(x - player.x, y - player.y) > SAFE_DISTANCE:
+                return x, y
+
+    def place_enemy(self, cls):
+        x, y = self.away_from_player()
+        if cls is WanderingEnemy:
+            enemy = acquire(cls, x, y, self.ai_rng)
+        else:
+            enemy = acquire(cls, x, y)
+        self.add_enemy(enemy)
+        self.live[cls] += 1
+
+    def kill_enemy(self, enemy):
+        if enemy.health > 0:
+            self.enemy_grid.discard(enemy)
+            self.world.discard(enemy)
+            enemy.x, enemy.y = self.away_from_player()
+            if engine_module.USE_BATCH_STEERING:
+                self.world.add(enemy)
+        enemy.health = enemy.max_health
+
+    def score_kill(self, enemy):
+        pass
+
+    def handle_collisions(self):
+        store = self.bullet_store
+        alive = store.alive[:store.count].copy()
+        super().handle_collisions()
+        store.alive[:store.count] = alive
+
+    def fire(self, kind):
+        rng = self.placement_rng
+        x = rng.uniform(0, WIDTH)
+        y = rng.uniform(0, HEIGHT)
+        if kind == "bullet":
+            bullet = acquire(Bullet, x, y, rng.uniform(0, 2 * math.pi))
+            self.bullet_store.add_projectile(bullet)
+            release(bullet)
+        elif kind == "enemy_bullet":
+            bullet = acquire(EnemyBullet, x, y, rng.uniform(0, 2 * math.pi))
+            self.enemy_bullets.add_projectile(bullet)
+            release(bullet)
+        elif kind == "laser":
+            self.add_bullet(acquire(LaserBeam, x, y, rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)))
+        elif self.enemies.items:
+            target = rng.choice(self.enemies.items)
+            if target.alive:
+                self.add_bullet(acquire(Missile, x, y, target))
+
+    def spawn_enemies(self):
+        for cls, count in self.enemy_counts.items():
+            for _ in range(count - self.live[cls]):
+                self.place_enemy(cls)
+        
+        live = {
+            "bullet": len(self.bullet_store),
+            "enemy_bullet": len(self.enemy_bullets),
+            "laser": len(self.lasers),
+            "missile": len(self.bullets),
+        }
+        for kind, count in self.projectile_counts.items():
+            for _ in range(count - live[kind]):
+                self.fire(kind)
+
+def summarize(samples):
+    values = np.asarray(samples, dtype=np.float64) / 1e6
+    return {
+        "median_ms": round(float(np.median(values)), 4),
+        "p99_ms": round(float(np.percentile(values, 99)), 4),
+        "mean_ms": round(float(values.mean()), 4),
+        "max_ms": round(float(values.max()), 4),
+    }
+
+def run_scenario(enemy_counts, projectile_counts, ticks=300, warmup=30, seed=0, script="strafe", render=True):
+    engine = PinnedEngine(enemy_counts, projectile_counts, seed)
+    engine.timings = {}
+    script = SCRIPTS[script]
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) if render else None
+    
+    names = STAGES + (("render",) if render else ()) + ("frame",)
+    samples = {name: [] for name in names}
+    entity_samples = {"enemies": [], "bullets": [], "enemy_bullets": [], "beams_and_missiles": []}
+    
+    for tick in range(warmup + ticks):
+        engine.timings.clear()
+        start = perf_counter_ns()
+        engine.step(script(tick))
+        if surface is not None:
+            render_start = perf_counter_ns()
+            surface.fill((0, 0, 0))
+            engine.render(surface)
+            render_time = perf_counter_ns() - render_start
+        frame_time = perf_counter_ns() - start
+        if tick < warmup:
+            continue
+        
+        for name in STAGES:
+            samples[name].append(engine.timings[name])
+        if surface is not None:
+            samples["render"].append(render_time)
+        samples["frame"].append(frame_time)
+        entity_samples["enemies"].append(len(engine.enemies))
+        entity_samples["bullets"].append(len(engine.bullet_store))
+        entity_samples["enemy_bullets"].append(len(engine.enemy_bullets))
+        entity_samples["beams_and_missiles"].append(len(engine.lasers) + len(engine.bullets))
+    
+    return {
+        "scenario": {"enemies": enemy_counts, "projectiles": projectile_counts},
+        "ticks": ticks,
+        "warmup": warmup,
+        "seed": seed,
+        "script": script.__name__,
+        "config": {
+            "spatial_hash": engine_module.USE_SPATIAL_HASH,
+            "batch_steering": engine_module.USE_BATCH_STEERING,
+            "world": [WIDTH, HEIGHT],
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "stages": {name: summarize(values) for name, values in samples.items()},
+        "pinned": {
+            "enemies": sum(enemy_counts.values()),
+            "bullets": projectile_counts.get("bullet", 0),
+            "enemy_bullets": projectile_counts.get("enemy_bullet", 0),
+            "beams_and_missiles": projectile_counts.get("laser", 0) + projectile_counts.get("missile", 0),
+        },
+        "entities": {name: round(float(np.mean(values)), 1) for name, values in entity_samples.items()},
+    }
+
+def parse_counts(text, allowed):
+    counts = {}
+    if not text:
+        return counts
+    for item in text.split(","):
+        name, _, count = item.partition("=")
+        name = name.strip()
+        if name not in allowed:
+            raise argparse.ArgumentTypeError(f"unknown type {name!r}, expected one of {', '.join(allowed)}")
+        counts[name] = int(count)
+    return counts
+
+def compare(base, new, threshold=0.10, min_delta_ms=0.05):
+    rows = []
+    regressions = []
+    for stage, new_stats in new["stages"].items():
+        base_stats = base["stages"].get(stage)
+        if base_stats is None:
+            continue
+        for metric in ("median_ms", "p99_ms"):
+            old_value = base_stats[metric]
+            new_value = new_stats[metric]
+            delta = new_value - old_value
+            ratio = delta / old_value if old_value else 0.0
+            regressed = delta > min_delta_ms and ratio > threshold
+            rows.append((stage, metric, old_value, new_value, ratio, regressed))
+            if regressed:
+                regressions.append(f"{stage} {metric}")
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinned-entity stress scenarios with per-stage timings.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = commands.add_parser("run", help="run a scenario and write JSON results")
+    run_parser.add_argument("--preset", choices=sorted(PRESETS, key=int), default="1000")
+    run_parser.add_argument("--enemies", help="override the enemy mix, e.g. normal=100,boss=2")
+    run_parser.add_argument("--projectiles", help="override the projectile mix, e.g. bullet=500,laser=5")
+    run_parser.add_argument("--ticks", type=int, default=300)
+    run_parser.add_argument("--warmup", type=int, default=30)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--script", choices=sorted(SCRIPTS), default="strafe")
+    run_parser.add_argument("--no-render", action="store_true")
+    run_parser.add_argument("--out", help="write results here instead of stdout")
+    
+    compare_parser = commands.add_parser("compare", help="diff two result files and fail on regressions")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore smaller absolute changes")
+    
+    args = parser.parse_args()
+    
+    if args.command == "run":
+        preset = PRESETS[args.preset]
+        enemies = parse_counts(args.enemies, ENEMY_TYPES) if args.enemies else preset["enemies"]
+        projectiles = parse_counts(args.projectiles, PROJECTILE_KINDS) if args.projectiles else preset["projectiles"]
+        result = run_scenario(enemies, projectiles, args.ticks, args.warmup, args.seed, args.script,
+                              not args.no_render)
+        text = json.dumps(result, indent=2)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return
+    
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    rows, regressions = compare(base, new, args.threshold, args.min_delta_ms)
+    print(f"{'stage':<14}{'metric':<11}{'base':>10}{'new':>10}{'change':>9}")
+    for stage, metric, old_value, new_value, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{stage:<14}{metric:<11}{old_value:>10.3f}{new_value:>10.3f}{ratio:>+9.1%}{flag}")
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import engine
+from engine import QUALITY_LEVELS, GameEngine
+from enemy import Enemy
+from headless import make_script
+from player import create_player
+
+def run(monkeypatch, batch, level, ticks=900):
+    monkeypatch.setattr(engine, "USE_BATCH_STEERING", batch)
+    game = GameEngine(create_player("normal", 400, 300), seed=4)
+    game.set_quality(level)
+    game.player.health = 10 ** 9
+    game.enemy_spawn_delay = 5
+    script = make_script("bot", game)
+    hashes = []
+    for tick in range(ticks):
+        game.step(script(tick))
+        hashes.append(game.state_hash())
+    return game, hashes
+
+def test_sliced_ai_matches_between_batch_and_scalar(monkeypatch):
+    level = len(QUALITY_LEVELS) - 1
+    assert QUALITY_LEVELS[level]["ai_slices"] > 1
+    game, batch = run(monkeypatch, True, level)
+    assert len(game.world.wanderers) and len(game.world.guns)
+    _, scalar = run(monkeypatch, False, level)
+    assert batch == scalar
+
+def test_slicing_takes_effect(monkeypatch):
+    _, full = run(monkeypatch, True, 3, ticks=300)
+    _, sliced = run(monkeypatch, True, len(QUALITY_LEVELS) - 1, ticks=300)
+    assert full != sliced
+
+def test_sliced_ai_ignores_enemies_built_elsewhere(monkeypatch):
+    level = len(QUALITY_LEVELS) - 1
+    _, first = run(monkeypatch, True, level, ticks=400)
+    strays = [Enemy(0, 0) for _ in range(3)]
+    _, second = run(monkeypatch, True, level, ticks=400)
+    assert strays and first == second
@@ -0,0 +1,70 @@
+import json
+import random
+import pytest
+from enemy import ENEMY_REGISTRY, ENEMY_TABLE, Enemy, EnemyRegistry, ShooterEnemy, SwarmEnemy, load_enemy_table
+from player import create_player
+
+def copy_table():
+    return {name: dict(entry) for name, entry in ENEMY_TABLE.items()}
+
+def test_json_table_round_trip(tmp_path):
+    path = tmp_path / "enemies.json"
+    path.write_text(json.dumps(copy_table()), encoding="utf-8")
+    registry = EnemyRegistry(load_enemy_table(str(path)))
+    enemy = registry.create("boss", 0, 0)
+    assert enemy.outline == (5, 4)
+    assert enemy.health_bar[:3] == (80, 8, 15)
+    assert registry.spawn_types == [name for name in ENEMY_TABLE if name != "boss"]
+
+def test_builtin_name_with_other_behavior_gets_own_class(tmp_path):
+    table = copy_table()
+    shooter = table["shooter"]
+    for key in ("shoot_delay", "shoot_range", "standoff"):
+        del shooter[key]
+    shooter["behavior"] = "chase"
+    path = tmp_path / "enemies.json"
+    path.write_text(json.dumps(table), encoding="utf-8")
+    registry = EnemyRegistry(load_enemy_table(str(path)))
+    
+    cls = registry.types["shooter"]
+    assert cls is not ShooterEnemy
+    assert issubclass(cls, Enemy) and not issubclass(cls, ShooterEnemy)
+    assert cls.components == ("chase",)
+    enemy = registry.create("shooter", 100, 100)
+    enemy.update(create_player("normal", 400, 300))
+    assert enemy.x > 100
+
+def test_builtin_class_extended_for_matching_behavior():
+    registry = EnemyRegistry(ENEMY_TABLE)
+    shooter = registry.types["shooter"]
+    assert shooter is not ShooterEnemy and issubclass(shooter, ShooterEnemy)
+    assert shooter.__name__ == "ShooterEnemy"
+    assert issubclass(registry.types["swarm"], SwarmEnemy)
+
+def test_second_registry_leaves_classes_alone():
+    table = copy_table()
+    table["shooter"]["shoot_range"] = 50
+    table["shooter"]["shield"] = 3
+    registry = EnemyRegistry(table)
+    assert registry.types["shooter"].shoot_range == 50
+    assert registry.create("shooter", 0, 0).shield == 3
+    
+    shoot_range = ENEMY_TABLE["shooter"]["shoot_range"]
+    assert ShooterEnemy.shoot_range == shoot_range
+    assert not hasattr(ShooterEnemy, "shield")
+    assert ENEMY_REGISTRY.types["shooter"].shoot_range == shoot_range
+    assert ENEMY_REGISTRY.stats["shooter"]["shoot_range"] == shoot_range
+    assert "shield" not in ENEMY_REGISTRY.stats["shooter"]
+
+def test_missing_required_stat_is_rejected():
+    table = copy_table()
+    del table["wandering"]["change_direction_delay"]
+    with pytest.raises(ValueError, match="change_direction_delay"):
+        EnemyRegistry(table)
+
+def test_pick_uses_spawn_weights():
+    registry = EnemyRegistry(ENEMY_TABLE)
+    rng = random.Random(0)
+    picks = {registry.pick(rng) for _ in range(500)}
+    assert "boss" not in picks
+    assert picks == set(registry.spawn_types)
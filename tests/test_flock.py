@@ -0,0 +1,34 @@
+import random
+import numpy as np
+from enemy import SwarmEnemy
+from player import create_player
+from spatial import neighbor_pairs
+from steering import FLOCK_RADIUS, FlockSteering, flock
+
+def test_neighbor_pairs_match_brute_force():
+    rng = np.random.default_rng(5)
+    x = np.concatenate((rng.uniform(-200, 900, 400), np.full(5, 96.0), np.arange(5) * FLOCK_RADIUS))
+    y = np.concatenate((rng.uniform(-150, 700, 400), np.full(5, 48.0), np.zeros(5)))
+    i, j, dx, dy = neighbor_pairs(x, y, FLOCK_RADIUS)
+    found = {(min(a, b), max(a, b)) for a, b in zip(i.tolist(), j.tolist())}
+    assert len(found) == len(i)
+    gap_x = x[None, :] - x[:, None]
+    gap_y = y[None, :] - y[:, None]
+    near = gap_x * gap_x + gap_y * gap_y < FLOCK_RADIUS * FLOCK_RADIUS
+    a, b = np.nonzero(np.triu(near, 1))
+    assert found == set(zip(a.tolist(), b.tolist()))
+    assert np.array_equal(dx, x[j] - x[i]) and np.array_equal(dy, y[j] - y[i])
+
+def test_batch_flock_matches_scalar():
+    rng = random.Random(2)
+    player = create_player("normal", 400, 300)
+    batch = [SwarmEnemy(rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(300)]
+    scalar = [SwarmEnemy(boid.x, boid.y) for boid in batch]
+    table = FlockSteering()
+    for boid in batch:
+        table.add(boid)
+    for tick in range(100):
+        player.x = 400 + tick
+        table.step(player)
+        flock(scalar, player)
+        assert [(boid.x, boid.y) for boid in batch] == [(boid.x, boid.y) for boid in scalar]
@@ -0,0 +1,88 @@
+import random
+import numpy as np
+import pytest
+from camera import Camera
+from enemy import BossEnemy, Enemy, SwarmEnemy, TankEnemy
+from engine import LASER_BATCH_MIN, FrameInput, GameEngine, KeySet
+from player import create_player
+from projectile import WIDTH, HEIGHT, LaserBeam
+from spatial import SpatialHash
+
+def random_lasers(rng, count):
+    lasers = []
+    for _ in range(count):
+        x = rng.uniform(0, WIDTH)
+        y = rng.uniform(0, HEIGHT)
+        lasers.append(LaserBeam(x, y, x + rng.uniform(-400, 400), y + rng.uniform(-400, 400)))
+    return lasers
+
+def edge_lasers():
+    lasers = [LaserBeam(400, 300, 400, 0), LaserBeam(400, 300, 0, 300), LaserBeam(0, 0, WIDTH, HEIGHT),
+              LaserBeam(WIDTH, 0, 0, HEIGHT)]
+    point = LaserBeam(400, 300, 500, 300)
+    point.end_x, point.end_y = 400, 300
+    short = LaserBeam(100, 100, 200, 100)
+    short.end_x, short.end_y = 200, 100
+    return lasers + [point, short]
+
+def edge_circles():
+    return [(400, 300, 10), (400, 310, 10), (410, 300, 10), (200, 110, 10), (210, 100, 10), (211, 100, 10),
+            (90, 100, 10), (89.999, 100, 10), (150, 100, 0), (150, 100.5, 0.5), (0, 0, 1), (WIDTH, HEIGHT, 40)]
+
+def random_enemies(rng, count):
+    kinds = (Enemy, SwarmEnemy, TankEnemy, BossEnemy)
+    return [rng.choice(kinds)(rng.uniform(-60, WIDTH + 60), rng.uniform(-60, HEIGHT + 60)) for _ in range(count)]
+
+@pytest.mark.parametrize("seed", range(4))
+def test_hit_mask_matches_check_circle_collision(seed):
+    rng = random.Random(seed)
+    circles = edge_circles() + [(rng.uniform(-50, WIDTH + 50), rng.uniform(-50, HEIGHT + 50), rng.choice((6, 10, 15, 40)))
+                                for _ in range(500)]
+    xs, ys, radii = (np.array(column, dtype=np.float64) for column in zip(*circles))
+    for laser in edge_lasers() + random_lasers(rng, 40):
+        expected = [laser.check_circle_collision(x, y, radius) for x, y, radius in circles]
+        assert laser.hit_mask(xs, ys, radii).tolist() == expected
+
+@pytest.mark.parametrize("seed", range(4))
+def test_query_segment_covers_every_hit(seed):
+    rng = random.Random(seed)
+    enemies = random_enemies(rng, 400)
+    grid = SpatialHash()
+    grid.rebuild(enemies)
+    for laser in edge_lasers() + random_lasers(rng, 60):
+        candidates = grid.query_segment(laser.x, laser.y, laser.end_x, laser.end_y)
+        assert len(candidates) == len(set(candidates))
+        assert candidates == [enemy for enemy in enemies if enemy in set(candidates)]
+        hits = {enemy for enemy in enemies if laser.check_circle_collision(enemy.x, enemy.y, enemy.radius)}
+        assert hits <= set(candidates)
+
+@pytest.mark.parametrize("count", (LASER_BATCH_MIN - 1, 400))
+def test_laser_hits_match_brute_force(count):
+    rng = random.Random(count)
+    game = GameEngine(create_player("laser", 400, 300), seed=0)
+    enemies = random_enemies(rng, count)
+    game.enemies.extend(enemies)
+    game.enemy_grid.rebuild(game.enemies)
+    for laser in edge_lasers() + random_lasers(rng, 40):
+        hits = [enemy for enemy in enemies if laser.check_circle_collision(enemy.x, enemy.y, enemy.radius)]
+        found = [enemy for enemy in game.laser_hits(laser)
+                 if laser.check_circle_collision(enemy.x, enemy.y, enemy.radius)]
+        assert found == hits
+
+def test_laser_stops_at_camera_view():
+    beam = LaserBeam(400, 300, 500, 350, view=(200, 150, 600, 450))
+    assert beam.end_x == 600 and beam.end_y == 400
+    assert LaserBeam(400, 300, 400, 0, view=(200, 150, 600, 450)).end_y == 150
+    
+    game = GameEngine(create_player("laser", 400, 300), seed=0)
+    game.camera = Camera(400, 300, WIDTH, HEIGHT)
+    seen = Enemy(550, 300)
+    hidden = Enemy(700, 300)
+    game.enemies.extend((seen, hidden))
+    game.enemy_grid.rebuild(game.enemies)
+    game.update_player(FrameInput(KeySet(), (WIDTH, 300), True))
+    laser, = game.lasers
+    assert (laser.end_x, laser.end_y) == (600, 300)
+    game.handle_collisions()
+    assert seen.health < seen.max_health
+    assert hidden.health == hidden.max_health
@@ -0,0 +1,88 @@
+import random
+import pytest
+import engine
+from enemy import Enemy, TankEnemy
+from headless import SCRIPTS
+from missiles import BATCH_MIN, HomingMissiles
+from player import create_player
+from projectile import WIDTH, HEIGHT, Missile
+
+def launch(rng, targets, positions, table=None):
+    if table is None:
+        table = HomingMissiles()
+    pairs = []
+    for target, (x, y) in zip(targets, positions):
+        missile = Missile(x, y, target)
+        table.add(missile)
+        pairs.append((missile, Missile(x, y, target)))
+    return table, pairs
+
+def fly(rng, table, pairs, targets, ticks, lose_at=20):
+    for tick in range(ticks):
+        for target in targets:
+            target.x += rng.uniform(-3, 3)
+            target.y += rng.uniform(-3, 3)
+        if tick == lose_at:
+            for target in targets[::4]:
+                target.spawn_id = -1
+        expired = set(table.step())
+        flying = []
+        for missile, reference in pairs:
+            alive = reference.update() and not reference.is_off_screen()
+            assert (missile.x, missile.y, missile.angle) == (reference.x, reference.y, reference.angle)
+            assert missile.lifetime == reference.lifetime
+            assert (missile in expired) == (not alive)
+            if alive:
+                flying.append((missile, reference))
+            else:
+                table.discard(missile)
+        pairs = flying
+    return pairs
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_scalar_per_tick(seed):
+    rng = random.Random(seed)
+    targets = [Enemy(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for _ in range(BATCH_MIN + 40)]
+    positions = [(rng.uniform(-40, WIDTH + 40), rng.uniform(-40, HEIGHT + 40)) for _ in targets]
+    table, pairs = launch(rng, targets, positions)
+    assert fly(rng, table, pairs, targets, ticks=310) == []
+
+def test_batch_matches_scalar_at_the_edges():
+    rng = random.Random(7)
+    targets = [Enemy(400, 300), Enemy(400, 300), Enemy(0, 0), Enemy(WIDTH, HEIGHT), Enemy(400, 300), Enemy(-45, 300)]
+    positions = [(400, 300), (399.9, 300), (WIDTH + 49, HEIGHT + 49), (-49, -49), (100, 300), (-49, 300)]
+    targets *= BATCH_MIN // len(targets) + 1
+    positions *= BATCH_MIN // len(positions) + 1
+    table, pairs = launch(rng, targets, positions)
+    fly(rng, table, pairs, targets, ticks=310, lose_at=5)
+
+def test_batch_resumes_after_scalar_steps():
+    rng = random.Random(11)
+    targets = [Enemy(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for _ in range(BATCH_MIN + 20)]
+    positions = [(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for _ in targets]
+    table, pairs = launch(rng, targets[:8], positions[:8])
+    pairs = fly(rng, table, pairs, targets[:8], ticks=30, lose_at=-1)
+    assert len(table) < BATCH_MIN
+    table, more = launch(rng, targets[8:], positions[8:], table)
+    assert len(table) >= BATCH_MIN
+    fly(rng, table, pairs + more, targets, ticks=60, lose_at=-1)
+
+def run_salvo(monkeypatch, batch, seed):
+    monkeypatch.setattr(engine, "USE_BATCH_MISSILES", batch)
+    rng = random.Random(seed)
+    game = engine.GameEngine(create_player("missile", WIDTH // 2, HEIGHT // 2), seed=seed)
+    game.player.health = 10 ** 9
+    for _ in range(BATCH_MIN * 2):
+        game.add_enemy(TankEnemy(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)))
+    enemies = list(game.enemies)
+    for _ in range(BATCH_MIN + 20):
+        game.add_bullet(Missile(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng.choice(enemies)))
+    hashes = []
+    for tick in range(300):
+        game.step(SCRIPTS["idle"](tick))
+        hashes.append(game.state_hash())
+    return hashes
+
+@pytest.mark.parametrize("seed", range(4))
+def test_engine_hashes_match_between_batch_and_scalar(monkeypatch, seed):
+    assert run_salvo(monkeypatch, True, seed) == run_salvo(monkeypatch, False, seed)
@@ -0,0 +1,69 @@
+import math
+import random
+import pytest
+from enemy import Enemy
+from spatial import CELL_SIZE, SpatialHash, nearest
+
+def brute_k_nearest(entities, x, y, k, max_distance=math.inf):
+    ranked = []
+    for order, entity in enumerate(entities):
+        distance = math.sqrt((entity.x - x)**2 + (entity.y - y)**2)
+        if distance < max_distance:
+            ranked.append((distance, order, entity))
+    ranked.sort(key=lambda item: (item[0], item[1]))
+    return [entity for _, _, entity in ranked[:k]]
+
+def scatter(rng, count, spread=1000):
+    enemies = [Enemy(rng.uniform(-spread, spread), rng.uniform(-spread, spread)) for _ in range(count)]
+    enemies += [Enemy(0, 0), Enemy(0, 0), Enemy(CELL_SIZE, 0), Enemy(-CELL_SIZE, -CELL_SIZE), Enemy(CELL_SIZE * 3, 7)]
+    return enemies
+
+def probes(rng, count):
+    points = [(0, 0), (CELL_SIZE / 2, 0), (CELL_SIZE, CELL_SIZE), (-1e-9, -1e-9), (5000, -5000), (CELL_SIZE * 2, 7)]
+    return points + [(rng.uniform(-1200, 1200), rng.uniform(-1200, 1200)) for _ in range(count)]
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("max_distance", (math.inf, CELL_SIZE, 150.0, 1.0))
+def test_grid_nearest_matches_brute_force(seed, max_distance):
+    rng = random.Random(seed)
+    enemies = scatter(rng, 200 * (seed + 1))
+    grid = SpatialHash()
+    grid.rebuild(enemies)
+    for x, y in probes(rng, 100):
+        assert grid.nearest(x, y, max_distance) is nearest(enemies, x, y, max_distance)
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("k", (1, 3, 16))
+def test_grid_k_nearest_matches_brute_force(seed, k):
+    rng = random.Random(seed)
+    enemies = scatter(rng, 300)
+    grid = SpatialHash()
+    grid.rebuild(enemies)
+    for x, y in probes(rng, 60):
+        for max_distance in (math.inf, 200.0):
+            assert grid.k_nearest(x, y, k, max_distance) == brute_k_nearest(enemies, x, y, k, max_distance)
+
+def test_exact_range_is_exclusive():
+    enemy = Enemy(CELL_SIZE, 0)
+    grid = SpatialHash()
+    grid.rebuild([enemy])
+    assert nearest([enemy], 0, 0, CELL_SIZE) is None
+    assert grid.nearest(0, 0, CELL_SIZE) is None
+    assert grid.nearest(0, 0, CELL_SIZE + 1e-9) is enemy
+
+def test_empty_grid():
+    grid = SpatialHash()
+    assert grid.nearest(0, 0) is None
+    assert grid.k_nearest(0, 0, 3) == []
+
+def test_nearest_after_discards():
+    rng = random.Random(9)
+    enemies = scatter(rng, 400)
+    grid = SpatialHash()
+    grid.rebuild(enemies)
+    for enemy in enemies[::3]:
+        grid.discard(enemy)
+    remaining = [enemy for index, enemy in enumerate(enemies) if index % 3]
+    for x, y in probes(rng, 80):
+        assert grid.nearest(x, y) is nearest(remaining, x, y)
+        assert grid.k_nearest(x, y, 5, 300.0) == brute_k_nearest(remaining, x, y, 5, 300.0)
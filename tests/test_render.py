@@ -0,0 +1,46 @@
+import random
+import pygame
+import pytest
+import engine
+from camera import SCREEN_WIDTH, SCREEN_HEIGHT
+from dirty import DirtyRenderer, FullRenderer
+from enemy import BossEnemy, Enemy, FastEnemy, ShooterEnemy, SwarmEnemy, TankEnemy
+from engine import GameEngine
+from player import create_player
+
+def crowd(seed):
+    rng = random.Random(seed)
+    game = GameEngine(create_player("normal", 400, 300), seed=seed)
+    kinds = (Enemy, FastEnemy, TankEnemy, ShooterEnemy, SwarmEnemy, TankEnemy)
+    for _ in range(150):
+        enemy = rng.choice(kinds)(rng.gauss(400, 120), rng.gauss(300, 90))
+        enemy.health = rng.uniform(1, enemy.max_health)
+        game.add_enemy(enemy)
+    for _ in range(3):
+        boss = BossEnemy(rng.gauss(400, 100), rng.gauss(300, 80))
+        boss.health = rng.uniform(1, boss.max_health)
+        game.add_enemy(boss)
+    return game
+
+def frame(monkeypatch, game, sprites):
+    monkeypatch.setattr(engine, "USE_SPRITES", sprites)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    surface.fill((0, 0, 0))
+    game.render(surface)
+    return pygame.image.tobytes(surface, "RGB")
+
+@pytest.mark.parametrize("level", (0, 1))
+@pytest.mark.parametrize("seed", range(3))
+def test_sprite_path_matches_draw_path(monkeypatch, seed, level):
+    game = crowd(seed)
+    game.set_quality(level)
+    assert frame(monkeypatch, game, True) == frame(monkeypatch, game, False)
+
+@pytest.mark.parametrize("renderer", (FullRenderer, DirtyRenderer))
+def test_static_screen_painted_once(renderer):
+    renderer = renderer(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)))
+    assert renderer.static_changed(("paused",))
+    assert not renderer.static_changed(("paused",))
+    assert renderer.static_changed(("game_over", 10))
+    renderer.clear()
+    assert renderer.static_changed(("game_over", 10))
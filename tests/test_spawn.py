@@ -0,0 +1,29 @@
+import random
+from camera import Camera
+from enemy import BossEnemy, spawn_enemy, spawn_wave
+
+def test_boss_spawns_relative_to_area():
+    camera = Camera(800, 600, 3000, 2000)
+    area = camera.area_around(1500, 1000)
+    assert area == (1100, 700, 1900, 1300)
+    boss = spawn_enemy("boss", random.Random(0), area=area)
+    assert isinstance(boss, BossEnemy)
+    assert (boss.x, boss.y) == (1500, 650)
+
+def test_boss_default_area_matches_arena():
+    boss = spawn_enemy("boss", random.Random(0), area=(0, 0, 800, 600))
+    assert (boss.x, boss.y) == (400, -50)
+
+def test_spawns_ring_the_area():
+    area = (1100, 700, 1900, 1300)
+    rng = random.Random(3)
+    enemies = [spawn_enemy(None, rng, area=area) for _ in range(200)]
+    enemies += spawn_wave(200, rng, area=area)
+    for enemy in enemies:
+        on_vertical = enemy.x in (1050, 1950) and 700 <= enemy.y <= 1300
+        on_horizontal = enemy.y in (650, 1350) and 1100 <= enemy.x <= 1900
+        assert on_vertical or on_horizontal, (enemy.x, enemy.y)
+
+def test_wave_boss_spawns_relative_to_area():
+    (boss,) = spawn_wave(1, random.Random(0), types=["boss"], weights=[1], area=(1100, 700, 1900, 1300))
+    assert (boss.x, boss.y) == (1500, 650)
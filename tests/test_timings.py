@@ -0,0 +1,15 @@
+import itertools
+import engine
+from engine import STAGES, GameEngine
+from headless import SCRIPTS
+from player import create_player
+
+def test_step_timings_accumulate_within_a_frame(monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(engine, "perf_counter_ns", lambda: next(clock))
+    game = GameEngine(create_player("normal", 400, 300), seed=0)
+    game.timings = {}
+    script = SCRIPTS["strafe"]
+    for tick in range(3):
+        game.step(script(tick))
+    assert game.timings == dict.fromkeys(STAGES, 3)
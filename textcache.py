@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+class TextCache:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        surface = font.render(text, antialias, color)
+        surfaces[key] = surface
+        self.misses += 1
+        if len(surfaces) > self.capacity:
+            surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def __len__(self):
+        return len(self.surfaces)
+
+TEXT_CACHE = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    return TEXT_CACHE.render(font, text, color, antialias)
+
+class Hud:
+    def __init__(self):
+        self.lines = {}
+        self.renders = 0
+
+    def line(self, key, font, template, color, *values):
+        line = self.lines.get(key)
+        if line is not None and line[0] == values and line[1] is font and line[2] == color:
+            return line[3]
+        
+        surface = font.render(template.format(*values), True, color)
+        self.lines[key] = (values, font, color, surface)
+        self.renders += 1
+        return surface
+
+    def clear(self):
+        self.lines.clear()
@@ -0,0 +1,43 @@
+from shooting import EnemyGuns
+from steering import ChaseSteering, FlockSteering, WanderSteering
+
+class EnemyWorld:
+    def __init__(self):
+        self.chasers = ChaseSteering()
+        self.wanderers = WanderSteering()
+        self.flock = FlockSteering()
+        self.guns = EnemyGuns()
+        self.tables = {
+            "chase": self.chasers,
+            "wander": self.wanderers,
+            "flock": self.flock,
+            "shooter": self.guns,
+        }
+        self.archetypes = {}
+
+    def archetype(self, cls):
+        tables = self.archetypes.get(cls)
+        if tables is None:
+            tables = self.archetypes[cls] = tuple(self.tables[name] for name in cls.components)
+        return tables
+
+    def __contains__(self, enemy):
+        return enemy in self.chasers or enemy in self.wanderers or enemy in self.flock
+
+    def add(self, enemy):
+        for table in self.archetype(type(enemy)):
+            table.add(enemy)
+
+    def discard(self, enemy):
+        for table in self.archetype(type(enemy)):
+            table.discard(enemy)
+
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+
+    def step(self, player, emitter, tick=0, slices=1):
+        self.chasers.step(player)
+        self.wanderers.step(tick, slices)
+        self.flock.step(player)
+        self.guns.step(player, self.chasers, emitter, tick, slices)